@@ -0,0 +1,275 @@
+"""
+Benchmarks for the BMI Calculator.
+
+Covers:
+    index      the queries behind the GUI's History, Graph and Statistics
+               buttons on a synthetic database, before and after migrating
+               it from the original unindexed schema
+    coldstart  time to start Python and import the core library, the GUI
+               module, and the GUI's former eager imports (Tk + matplotlib)
+    vectorized calculate_bmi/bmi_category over a column of measurements,
+               scalar loop against the NumPy array versions
+    timestamps database size and date-range queries with TEXT timestamps,
+               then after migrating to integer Unix seconds
+
+Usage:
+    python bmi_benchmark.py [--rows 2000000] [--users 2000] [--only index,timestamps]
+                            [--json results.json]
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from bmi_core.logic import bmi_category, calculate_bmi
+from bmi_core.schema import MIGRATIONS, migrate
+from bmi_core.vectorized import NUMPY_AVAILABLE, calculate_bmi_array, categorize_array, category_labels
+
+SECTIONS = ("index", "coldstart", "vectorized", "timestamps")
+
+# Each snippet runs in a fresh interpreter; "python" alone is the baseline
+COLD_STARTS = {
+    "python": "pass",
+    "import bmi_core": "import bmi_core",
+    "import omkar_bmi": "import omkar_bmi",
+    "eager GUI imports (before)": "import tkinter, sqlite3, matplotlib.pyplot",
+}
+
+QUERIES = {
+    "history": "SELECT timestamp, weight, height, bmi FROM bmi_records WHERE username=? ORDER BY timestamp DESC",
+    "graph": "SELECT timestamp, bmi FROM bmi_records WHERE username=? ORDER BY timestamp",
+    "stats": "SELECT bmi FROM bmi_records WHERE username=?",
+}
+
+# Date-range queries; the bounds are text or Unix seconds to match the schema
+RANGE_QUERIES = {
+    "all users, 30 days": "SELECT COUNT(*), AVG(bmi), MIN(bmi), MAX(bmi) FROM bmi_records "
+                          "WHERE timestamp >= ? AND timestamp < ?",
+    "one user, 1 year": "SELECT timestamp, bmi FROM bmi_records "
+                        "WHERE username=? AND timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+}
+RANGE_DAYS = {"all users, 30 days": 30, "one user, 1 year": 365}
+
+
+def synthetic_rows(rows, users, seed=0):
+    """Yield (username, weight, height, bmi, timestamp) rows spread over five years."""
+    rng = random.Random(seed)
+    start = datetime(2021, 1, 1)
+    span = 5 * 365 * 24 * 3600
+    for _ in range(rows):
+        height = round(rng.uniform(1.5, 2.0), 2)
+        weight = round(rng.uniform(45, 120), 1)
+        timestamp = start + timedelta(seconds=rng.randrange(span))
+        yield (f"user{rng.randrange(users)}", weight, height, round(weight / height ** 2, 2),
+               timestamp.strftime("%Y-%m-%d %H:%M:%S"))
+
+
+def build_database(path, rows, users):
+    """Create an unversioned database in the original schema and fill it."""
+    conn = sqlite3.connect(path)
+    MIGRATIONS[0][2](conn)
+    conn.executemany("INSERT INTO bmi_records VALUES (NULL, ?, ?, ?, ?, ?)", synthetic_rows(rows, users))
+    conn.commit()
+    return conn
+
+
+def time_queries(conn, users, repeats):
+    """Return the median seconds of each GUI query over `repeats` random users."""
+    rng = random.Random(1)
+    names = [f"user{rng.randrange(users)}" for _ in range(repeats)]
+    results = {}
+    for name, sql in QUERIES.items():
+        timings = []
+        for user in names:
+            start = time.perf_counter()
+            conn.execute(sql, (user,)).fetchall()
+            timings.append(time.perf_counter() - start)
+        results[name] = statistics.median(timings)
+    return results
+
+
+def query_plan(conn, sql):
+    """Return SQLite's query plan for a GUI query as one line."""
+    return "; ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, ("user0",)))
+
+
+def bench_index(rows, users, repeats):
+    """Time the GUI queries before and after indexing a synthetic database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = build_database(os.path.join(tmp, "bench.db"), rows, users)
+        try:
+            before = time_queries(conn, users, repeats)
+            plans_before = {name: query_plan(conn, sql) for name, sql in QUERIES.items()}
+
+            start = time.perf_counter()
+            migrate(conn, version=3)
+            migration_seconds = time.perf_counter() - start
+
+            after = time_queries(conn, users, repeats)
+            plans_after = {name: query_plan(conn, sql) for name, sql in QUERIES.items()}
+        finally:
+            conn.close()
+
+    print(f"\n[index] {rows:,} rows, {users:,} users, migration took {migration_seconds:.2f} s")
+    print(f"  {'query':<10} {'before':>12} {'after':>12} {'speedup':>9}")
+    for name in QUERIES:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"  {name:<10} {before[name] * 1e3:9.2f} ms {after[name] * 1e3:9.2f} ms {speedup:8.1f}x")
+        print(f"    before: {plans_before[name]}")
+        print(f"    after:  {plans_after[name]}")
+    return {"rows": rows, "users": users, "migration_seconds": migration_seconds,
+            "before": before, "after": after}
+
+
+def database_size(conn):
+    """Return the database size in bytes after VACUUM reclaims free pages."""
+    conn.execute("VACUUM")
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    return conn.execute("PRAGMA page_count").fetchone()[0] * page_size
+
+
+def time_ranges(conn, users, repeats, epoch):
+    """Return the median seconds of each RANGE_QUERIES query over random windows."""
+    rng = random.Random(3)
+    first = datetime(2021, 1, 1)
+    results = {}
+    for name, sql in RANGE_QUERIES.items():
+        timings = []
+        for _ in range(repeats):
+            start = first + timedelta(days=rng.randrange(5 * 365 - RANGE_DAYS[name]))
+            bounds = [start, start + timedelta(days=RANGE_DAYS[name])]
+            bounds = [int(b.timestamp()) if epoch else b.strftime("%Y-%m-%d %H:%M:%S") for b in bounds]
+            params = bounds if name.startswith("all") else [f"user{rng.randrange(users)}", *bounds]
+            began = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            timings.append(time.perf_counter() - began)
+        results[name] = statistics.median(timings)
+    return results
+
+
+def bench_timestamps(rows, users, repeats):
+    """Compare size and date-range queries of TEXT and integer timestamps."""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = build_database(os.path.join(tmp, "bench.db"), rows, users)
+        try:
+            migrate(conn, version=3)
+            size_before = database_size(conn)
+            before = time_ranges(conn, users, repeats, epoch=False)
+
+            start = time.perf_counter()
+            migrate(conn, version=4)
+            migration_seconds = time.perf_counter() - start
+            size_after = database_size(conn)
+            after = time_ranges(conn, users, repeats, epoch=True)
+        finally:
+            conn.close()
+
+    print(f"\n[timestamps] {rows:,} rows, {users:,} users, migration took {migration_seconds:.2f} s")
+    print(f"  {'database size':<20} {size_before / 2 ** 20:9.1f} MB {size_after / 2 ** 20:9.1f} MB"
+          f" {size_after / size_before:8.0%}")
+    print(f"  {'query':<20} {'text':>12} {'integer':>12} {'speedup':>9}")
+    for name in RANGE_QUERIES:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"  {name:<20} {before[name] * 1e3:9.2f} ms {after[name] * 1e3:9.2f} ms {speedup:8.1f}x")
+    return {"rows": rows, "users": users, "migration_seconds": migration_seconds,
+            "size_before": size_before, "size_after": size_after, "before": before, "after": after}
+
+
+def cold_start(code, runs):
+    """Return the median wall time of `runs` fresh interpreters running code, or None if it fails."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        done = subprocess.run([sys.executable, "-c", code], cwd=here,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+        if done.returncode:
+            return None
+    return statistics.median(timings)
+
+
+def bench_coldstart(runs):
+    """Time interpreter start-up plus each import in COLD_STARTS."""
+    print(f"\n[coldstart] median of {runs} runs")
+    results = {}
+    for name, code in COLD_STARTS.items():
+        seconds = results[name] = cold_start(code, runs)
+        if seconds is None:
+            print(f"  {name:<28} {'n/a (import failed)':>12}")
+        else:
+            print(f"  {name:<28} {seconds * 1e3:9.1f} ms")
+    return results
+
+
+def bench_vectorized(rows):
+    """Compare the scalar BMI functions with the array versions on `rows` measurements."""
+    if not NUMPY_AVAILABLE:
+        print("\n[vectorized] skipped: NumPy is not installed")
+        return None
+    rng = random.Random(2)
+    weights = [round(rng.uniform(30, 200), 1) for _ in range(rows)]
+    heights = [round(rng.uniform(1.2, 2.2), 2) for _ in range(rows)]
+
+    start = time.perf_counter()
+    bmis = [calculate_bmi(w, h) for w, h in zip(weights, heights)]
+    categories = [bmi_category(b) for b in bmis]
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bmi_array = calculate_bmi_array(weights, heights)
+    codes = categorize_array(bmi_array)
+    vectorized = time.perf_counter() - start
+
+    identical = bmi_array.tolist() == bmis and category_labels(codes).tolist() == categories
+    print(f"\n[vectorized] {rows:,} measurements")
+    print(f"  scalar loop                  {scalar:8.3f} s  {rows / scalar:14,.0f} /s")
+    print(f"  calculate_bmi_array + bins   {vectorized:8.3f} s  {rows / vectorized:14,.0f} /s"
+          f"  ({scalar / vectorized:5.1f}x)")
+    print(f"  identical results: {'yes' if identical else 'NO'}")
+    return {"rows": rows, "scalar_seconds": scalar, "vectorized_seconds": vectorized,
+            "identical": identical}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the BMI Calculator.")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="rows in the synthetic database")
+    parser.add_argument("--users", type=int, default=2_000, help="distinct usernames")
+    parser.add_argument("--repeats", type=int, default=20, help="users queried per measurement")
+    parser.add_argument("--runs", type=int, default=10, help="interpreter starts per cold-start measurement")
+    parser.add_argument("--only", default=",".join(SECTIONS),
+                        help=f"comma-separated sections to run (default: {','.join(SECTIONS)})")
+    parser.add_argument("--json", metavar="FILE", help="also write results to FILE as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sections = [s.strip() for s in args.only.split(",") if s.strip()]
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        print(f"Unknown section(s): {', '.join(sorted(unknown))}", file=sys.stderr)
+        sys.exit(2)
+
+    runners = {
+        "index": lambda: bench_index(args.rows, args.users, args.repeats),
+        "coldstart": lambda: bench_coldstart(args.runs),
+        "vectorized": lambda: bench_vectorized(args.rows),
+        "timestamps": lambda: bench_timestamps(args.rows, args.users, args.repeats),
+    }
+    results = {section: runners[section]() for section in sections}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
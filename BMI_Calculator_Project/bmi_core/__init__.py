@@ -0,0 +1,35 @@
+"""
+Headless core of the BMI Calculator: BMI logic and database storage.
+
+Importing this package has no side effects: it opens no database and
+imports neither Tk nor matplotlib, so scripts and services can use it
+without the GUI. The modules that need NumPy (vectorized) or pyarrow
+(export) are not imported here either; import them directly.
+
+    from bmi_core import BMIStore, bmi_category, calculate_bmi
+"""
+from .logic import bmi_category, calculate_bmi, get_bmi_color
+from .pool import ConnectionPool
+from .schema import SCHEMA_VERSION, connect, migrate, rebuild_user_stats
+from .storage import (DEFAULT_DB, PAGE_SIZE, TIMESTAMP_FORMAT, BMIStore, UserStats, format_timestamp,
+                      to_epoch)
+from .writer import BackgroundWriter
+
+__all__ = [
+    "BackgroundWriter",
+    "BMIStore",
+    "ConnectionPool",
+    "DEFAULT_DB",
+    "PAGE_SIZE",
+    "SCHEMA_VERSION",
+    "TIMESTAMP_FORMAT",
+    "UserStats",
+    "bmi_category",
+    "calculate_bmi",
+    "connect",
+    "format_timestamp",
+    "get_bmi_color",
+    "migrate",
+    "rebuild_user_stats",
+    "to_epoch",
+]
@@ -0,0 +1,155 @@
+"""
+Streaming export of BMI records to CSV, JSON Lines or Parquet.
+
+Records are read from the database `batch_size` rows at a time with
+fetchmany and each batch is written before the next is read, so exporting
+every user's history takes constant memory:
+
+    with BMIStore() as store:
+        export_records(store.pool, "alice.csv", username="alice")
+
+CSV and JSON Lines files use the same columns and local-time timestamps as
+bmi_import.py, so an export can be imported again. Parquet needs pyarrow
+and stores the timestamp as a UTC timestamp column.
+"""
+import csv
+import json
+import os
+
+from .logic import bmi_category
+from .storage import format_timestamp
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = pq = None
+    PYARROW_AVAILABLE = False
+
+FORMATS = ("csv", "jsonl", "parquet")
+COLUMNS = ("username", "timestamp", "weight", "height", "bmi", "category")
+BATCH_SIZE = 10_000
+
+_EXPORT_SQL = "SELECT username, timestamp, weight, height, bmi FROM bmi_records"
+
+
+def detect_format(path):
+    """Guess the export format from a file name (default: csv)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if ext in (".parquet", ".pq"):
+        return "parquet"
+    return "csv"
+
+
+def iter_batches(pool, username=None, batch_size=BATCH_SIZE):
+    """
+    Yield lists of (username, timestamp, weight, height, bmi) rows.
+
+    Rows come in (username, timestamp) index order, oldest first. The reader
+    connection is held until the generator is exhausted or closed.
+
+    Args:
+        pool: ConnectionPool of the database.
+        username: Export only this user (default: everyone).
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1!")
+    if username is None:
+        sql, params = _EXPORT_SQL + " ORDER BY username, timestamp, id", ()
+    else:
+        sql, params = _EXPORT_SQL + " WHERE username=? ORDER BY timestamp, id", (username,)
+    with pool.reader() as conn:
+        cursor = conn.execute(sql, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield rows
+        finally:
+            cursor.close()
+
+
+def _text_rows(rows):
+    for username, timestamp, weight, height, bmi in rows:
+        yield username, format_timestamp(timestamp), weight, height, bmi, bmi_category(bmi)
+
+
+def write_csv(f, batches):
+    """Write batches as CSV with a header row; returns the number of records."""
+    writer = csv.writer(f)
+    writer.writerow(COLUMNS)
+    count = 0
+    for rows in batches:
+        writer.writerows(_text_rows(rows))
+        count += len(rows)
+    return count
+
+
+def write_jsonl(f, batches):
+    """Write batches as JSON Lines, one object per record; returns the number of records."""
+    count = 0
+    for rows in batches:
+        f.writelines(json.dumps(dict(zip(COLUMNS, row))) + "\n" for row in _text_rows(rows))
+        count += len(rows)
+    return count
+
+
+def write_parquet(path, batches):
+    """Write batches as Parquet, one row group per batch; returns the number of records."""
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow is required for Parquet export (pip install pyarrow)")
+    schema = pa.schema([
+        ("username", pa.string()),
+        ("timestamp", pa.timestamp("s", tz="UTC")),
+        ("weight", pa.float64()),
+        ("height", pa.float64()),
+        ("bmi", pa.float64()),
+        ("category", pa.string()),
+    ])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in batches:
+            usernames, timestamps, weights, heights, bmis = zip(*rows)
+            writer.write_batch(pa.record_batch([
+                pa.array(usernames, pa.string()),
+                pa.array(timestamps, pa.int64()).cast(schema.field("timestamp").type),
+                pa.array(weights, pa.float64()),
+                pa.array(heights, pa.float64()),
+                pa.array(bmis, pa.float64()),
+                pa.array([bmi_category(bmi) for bmi in bmis], pa.string()),
+            ], schema=schema))
+            count += len(rows)
+    return count
+
+
+def export_records(pool, path, fmt=None, username=None, batch_size=BATCH_SIZE):
+    """
+    Export one user's or every user's records to a file.
+
+    Args:
+        pool: ConnectionPool of the database (e.g. BMIStore.pool).
+        path: Output file.
+        fmt: One of FORMATS (default: from the file extension).
+        username: Export only this user (default: everyone).
+
+    Returns:
+        int: Number of records written.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}!")
+    if fmt == "parquet" and not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow is required for Parquet export (pip install pyarrow)")
+
+    batches = iter_batches(pool, username, batch_size)
+    try:
+        if fmt == "parquet":
+            return write_parquet(path, batches)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            return (write_csv if fmt == "csv" else write_jsonl)(f, batches)
+    finally:
+        batches.close()
@@ -0,0 +1,33 @@
+"""BMI calculation and categories."""
+
+# Upper bounds (exclusive) of every category but the last, in order; these
+# must match the checks in bmi_category and get_bmi_color
+BMI_THRESHOLDS = (18.5, 25, 30)
+CATEGORIES = ("Underweight", "Normal", "Overweight", "Obese")
+CATEGORY_COLORS = ("#4A90E2", "#2ECC71", "#F39C12", "#E74C3C")
+
+
+def calculate_bmi(weight, height):
+    return round(weight / (height ** 2), 2)
+
+
+def bmi_category(bmi):
+    if bmi < 18.5:
+        return "Underweight"
+    elif bmi < 25:
+        return "Normal"
+    elif bmi < 30:
+        return "Overweight"
+    else:
+        return "Obese"
+
+
+def get_bmi_color(bmi):
+    if bmi < 18.5:
+        return "#4A90E2"  # Blue for underweight
+    elif bmi < 25:
+        return "#2ECC71"  # Green for normal
+    elif bmi < 30:
+        return "#F39C12"  # Orange for overweight
+    else:
+        return "#E74C3C"  # Red for obese
@@ -0,0 +1,195 @@
+"""
+A small SQLite connection pool for using one database from several threads.
+
+Reads and writes go through different connections:
+
+* a single writer connection, used by one thread at a time under a lock,
+  so every write in the process is serialized in one place;
+* reader connections, lent to a thread for the length of a reader() block
+  and returned to the pool afterwards. A thread that already holds one gets
+  the same connection again, so helpers can call each other; it is only
+  returned once the last of the thread's nested blocks has ended.
+
+The database is put in WAL journal mode, where readers see the last
+committed transaction and neither block nor wait for the writer, so
+reports and background jobs can read while the GUI writes.
+
+SQLite compiles each distinct SQL string once per connection and keeps it in
+the connection's statement cache, so the query helpers below run prepared
+statements as long as callers pass fixed SQL with ? parameters.
+"""
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from .schema import migrate
+
+# Compiled statements kept per connection (sqlite3's default is 128)
+STATEMENT_CACHE = 256
+
+
+class ConnectionPool:
+    """
+    Per-thread reader connections and one writer connection for a database file.
+
+    Usage:
+        pool = ConnectionPool("bmi_data.db")
+        rows = pool.query("SELECT bmi FROM bmi_records WHERE username=?", ("alice",))
+        with pool.writer() as conn:
+            conn.execute("DELETE FROM bmi_records WHERE username=?", ("alice",))
+        pool.close()
+    """
+
+    def __init__(self, path, max_readers=8, timeout=30.0):
+        """
+        Args:
+            path: Database file. Each connection opens it separately, so
+                ":memory:" is not supported.
+            max_readers: Most reader connections open at once; further
+                threads wait for one to be returned.
+            timeout: Seconds to wait for a database lock or a free reader.
+        """
+        if max_readers < 1:
+            raise ValueError("A pool needs at least one reader connection!")
+        self.path = path
+        self.max_readers = max_readers
+        self.timeout = timeout
+
+        self._write_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_readers)
+        self._idle = queue.LifoQueue()
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+        self._closed = False
+
+        self._writer = self._open()
+        try:
+            migrate(self._writer)
+            self._writer.execute("PRAGMA journal_mode=WAL")
+        except BaseException:
+            self._writer.close()
+            raise
+
+    def _open(self):
+        # Connections move between threads, but only ever one thread uses
+        # a connection at a time (enforced by the lock and the idle queue)
+        return sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE)
+
+    @contextmanager
+    def reader(self):
+        """Lend the calling thread a read-only connection for the block."""
+        # Nested blocks in one thread share its lease; the connection goes
+        # back to the pool only when the outermost of them has ended, even
+        # if an inner one (e.g. a suspended iterate()) outlives the others
+        lease = getattr(self._local, "lease", None)
+        if lease is None:
+            lease = self._local.lease = SimpleNamespace(conn=None, depth=0)
+        if not lease.depth:
+            if self._closed:
+                raise RuntimeError("Connection pool is closed!")
+            if not self._slots.acquire(timeout=self.timeout):
+                raise RuntimeError("Timed out waiting for a free database connection!")
+            try:
+                lease.conn = self._idle.get_nowait()
+            except queue.Empty:
+                try:
+                    lease.conn = self._open()
+                    lease.conn.execute("PRAGMA query_only = ON")
+                except BaseException:
+                    self._slots.release()
+                    raise
+                with self._readers_lock:
+                    self._readers.append(lease.conn)
+        lease.depth += 1
+        try:
+            yield lease.conn
+        finally:
+            lease.depth -= 1
+            if not lease.depth:
+                conn, lease.conn = lease.conn, None
+                self._idle.put(conn)
+                self._slots.release()
+
+    @contextmanager
+    def writer(self):
+        """
+        Hold the writer connection inside a transaction for the block.
+
+        Commits when the block ends and rolls back if it raises. Not
+        reentrant: do not open a writer() block inside another.
+        """
+        with self._write_lock:
+            if self._closed:
+                raise RuntimeError("Connection pool is closed!")
+            with self._writer:
+                yield self._writer
+
+    def query(self, sql, params=()):
+        """Run a query on a reader connection and return all rows."""
+        with self.reader() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def query_one(self, sql, params=()):
+        """Run a query on a reader connection and return the first row, or None."""
+        with self.reader() as conn:
+            return conn.execute(sql, params).fetchone()
+
+    def iterate(self, sql, params=(), batch_size=1000):
+        """
+        Yield the rows of a query, fetched `batch_size` at a time.
+
+        The reader connection is held until the generator is exhausted or
+        closed, and memory stays bounded by one batch.
+        """
+        with self.reader() as conn:
+            cursor = conn.execute(sql, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        return
+                    yield from rows
+            finally:
+                cursor.close()
+
+    def execute(self, sql, params=()):
+        """
+        Run one statement in its own write transaction.
+
+        Returns:
+            int: Number of rows changed.
+        """
+        with self.writer() as conn:
+            return conn.execute(sql, params).rowcount
+
+    def executemany(self, sql, rows):
+        """
+        Run a statement for every row in a single write transaction.
+
+        Returns:
+            int: Number of rows changed.
+        """
+        with self.writer() as conn:
+            return conn.executemany(sql, rows).rowcount
+
+    def close(self):
+        """Close every connection; later calls raise RuntimeError."""
+        with self._write_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._writer.close()
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
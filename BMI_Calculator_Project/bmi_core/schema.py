@@ -0,0 +1,224 @@
+"""
+Versioned schema migrations for the BMI database.
+
+The schema version is kept in SQLite's `PRAGMA user_version`. migrate()
+applies every migration newer than that version in order, each one in its
+own transaction together with the version bump, so an interrupted upgrade
+leaves the database at the last fully applied version and simply resumes
+on the next start.
+
+To change the schema, append a (version, description, function) entry to
+MIGRATIONS; never edit a migration that has already shipped.
+"""
+import sqlite3
+
+
+def _create_records(conn):
+    # The original table; databases created before versioning already have it
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS bmi_records (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT,
+        weight REAL,
+        height REAL,
+        bmi REAL,
+        timestamp TEXT
+    )
+    """)
+
+
+def _index_user_timestamp(conn):
+    # History, graph and statistics all filter on username and sort by time
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_bmi_records_user_time ON bmi_records (username, timestamp)"
+    )
+
+
+# Fold one row into its user's aggregates
+_ADD_ROW = """
+    INSERT INTO user_stats VALUES ({row}.username, 1, {row}.bmi, {row}.bmi, {row}.bmi, {row}.timestamp, {row}.bmi)
+    ON CONFLICT (username) DO UPDATE SET
+        count = count + 1,
+        bmi_sum = bmi_sum + excluded.bmi_sum,
+        bmi_min = min(bmi_min, excluded.bmi_min),
+        bmi_max = max(bmi_max, excluded.bmi_max),
+        latest_bmi = CASE WHEN excluded.latest_timestamp >= latest_timestamp
+                          THEN excluded.latest_bmi ELSE latest_bmi END,
+        latest_timestamp = max(latest_timestamp, excluded.latest_timestamp);
+"""
+
+# Take one row out again. Count and sum are adjusted in place; min, max and
+# the latest reading are only looked up again when the removed row was one
+# of them, so deleting a whole history stays close to linear.
+_REMOVE_ROW = """
+    UPDATE user_stats SET count = count - 1, bmi_sum = bmi_sum - {row}.bmi
+    WHERE username = {row}.username;
+    DELETE FROM user_stats WHERE username = {row}.username AND count <= 0;
+    UPDATE user_stats SET
+        bmi_min = (SELECT MIN(bmi) FROM bmi_records WHERE username = {row}.username),
+        bmi_max = (SELECT MAX(bmi) FROM bmi_records WHERE username = {row}.username),
+        latest_timestamp = (SELECT MAX(timestamp) FROM bmi_records WHERE username = {row}.username),
+        latest_bmi = (SELECT bmi FROM bmi_records WHERE username = {row}.username
+                      ORDER BY timestamp DESC, id DESC LIMIT 1)
+    WHERE username = {row}.username
+      AND ({row}.bmi <= bmi_min OR {row}.bmi >= bmi_max OR {row}.timestamp >= latest_timestamp);
+"""
+
+
+def _create_user_stats(conn):
+    # Per-user count, sum, min, max and latest reading, so statistics are a
+    # single-row lookup however long the history is
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS user_stats (
+        username TEXT PRIMARY KEY,
+        count INTEGER NOT NULL,
+        bmi_sum REAL NOT NULL,
+        bmi_min REAL NOT NULL,
+        bmi_max REAL NOT NULL,
+        latest_timestamp TEXT,
+        latest_bmi REAL
+    )
+    """)
+    _create_stats_triggers(conn)
+    rebuild_user_stats(conn)
+
+
+def _create_stats_triggers(conn):
+    # Kept up to date by triggers, whoever writes to bmi_records
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS user_stats_insert AFTER INSERT ON bmi_records BEGIN
+        {_ADD_ROW.format(row="NEW")}
+    END
+    """)
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS user_stats_delete AFTER DELETE ON bmi_records BEGIN
+        {_REMOVE_ROW.format(row="OLD")}
+    END
+    """)
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS user_stats_update AFTER UPDATE ON bmi_records BEGIN
+        {_REMOVE_ROW.format(row="OLD")}
+        {_ADD_ROW.format(row="NEW")}
+    END
+    """)
+
+
+def _epoch_timestamps(conn):
+    # SQLite cannot change a column's type, so the table is rebuilt with
+    # INTEGER Unix seconds: 8 bytes or less per row instead of 19 characters,
+    # compared and sorted as plain numbers. The stored text is local time;
+    # the 'utc' modifier converts it so the epochs are true UTC seconds.
+    for trigger in ("user_stats_insert", "user_stats_delete", "user_stats_update"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute("""
+    CREATE TABLE bmi_records_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT,
+        weight REAL,
+        height REAL,
+        bmi REAL,
+        timestamp INTEGER
+    )
+    """)
+    conn.execute("""
+    INSERT INTO bmi_records_new (id, username, weight, height, bmi, timestamp)
+    SELECT id, username, weight, height, bmi, CAST(strftime('%s', timestamp, 'utc') AS INTEGER)
+    FROM bmi_records
+    """)
+    conn.execute("DROP TABLE bmi_records")
+    conn.execute("ALTER TABLE bmi_records_new RENAME TO bmi_records")
+    _index_user_timestamp(conn)
+    # Date-range queries across all users (reports, exports)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bmi_records_time ON bmi_records (timestamp)")
+
+    conn.execute("DROP TABLE user_stats")
+    conn.execute("""
+    CREATE TABLE user_stats (
+        username TEXT PRIMARY KEY,
+        count INTEGER NOT NULL,
+        bmi_sum REAL NOT NULL,
+        bmi_min REAL NOT NULL,
+        bmi_max REAL NOT NULL,
+        latest_timestamp INTEGER,
+        latest_bmi REAL
+    )
+    """)
+    _create_stats_triggers(conn)
+    rebuild_user_stats(conn)
+
+
+def rebuild_user_stats(conn):
+    """
+    Recompute user_stats from bmi_records, e.g. after editing the table by hand.
+
+    Runs in the caller's transaction; commit afterwards.
+
+    Returns:
+        int: Number of users.
+    """
+    conn.execute("DELETE FROM user_stats")
+    conn.execute("""
+    INSERT INTO user_stats
+    SELECT username, COUNT(*), SUM(bmi), MIN(bmi), MAX(bmi), MAX(timestamp),
+           (SELECT bmi FROM bmi_records AS r WHERE r.username = g.username
+            ORDER BY timestamp DESC, id DESC LIMIT 1)
+    FROM bmi_records AS g GROUP BY username
+    """)
+    return conn.execute("SELECT COUNT(*) FROM user_stats").fetchone()[0]
+
+
+MIGRATIONS = [
+    (1, "create bmi_records", _create_records),
+    (2, "index bmi_records on (username, timestamp)", _index_user_timestamp),
+    (3, "add user_stats aggregates maintained by triggers", _create_user_stats),
+    (4, "store timestamps as integer Unix seconds and index them", _epoch_timestamps),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn):
+    """Return the schema version stored in the database (0 for a new file)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn, version=SCHEMA_VERSION):
+    """
+    Bring a database up to SCHEMA_VERSION.
+
+    Args:
+        version: Stop at this version instead (for benchmarks and tests).
+
+    Returns:
+        list: Descriptions of the migrations that were applied.
+    """
+    current = schema_version(conn)
+    if current > SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema version {current} is newer than this program supports ({SCHEMA_VERSION})!"
+        )
+
+    applied = []
+    for target, description, apply in MIGRATIONS:
+        if target <= current or target > version:
+            continue
+        # BEGIN IMMEDIATE takes the write lock up front, so two processes
+        # starting at once cannot both apply the same migration
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(conn) < target:
+                apply(conn)
+                conn.execute(f"PRAGMA user_version = {target}")
+                applied.append(description)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return applied
+
+
+def connect(path):
+    """Open a BMI database and migrate it to the current schema."""
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    return conn
@@ -0,0 +1,217 @@
+"""
+Reading and writing BMI records.
+
+Timestamps are stored as integer Unix seconds (UTC). Use to_epoch() when
+writing and format_timestamp() or datetime.fromtimestamp() when reading.
+"""
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from .logic import calculate_bmi
+from .pool import ConnectionPool
+
+DEFAULT_DB = "bmi_data.db"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+PAGE_SIZE = 200
+
+INSERT_RECORD_SQL = "INSERT INTO bmi_records (username, weight, height, bmi, timestamp) VALUES (?, ?, ?, ?, ?)"
+
+UserStats = namedtuple("UserStats", "count average minimum maximum latest_timestamp latest_bmi")
+
+_PAGE_SQL = "SELECT id, timestamp, weight, height, bmi FROM bmi_records WHERE username=?"
+
+
+def to_epoch(value=None):
+    """
+    Convert a timestamp to the stored integer Unix seconds.
+
+    Args:
+        value: A datetime (naive means local time), ISO 8601 text such as
+            "2024-03-01 08:15:00", a number of seconds, or None for now.
+
+    Returns:
+        int: Seconds since 1970-01-01 UTC.
+    """
+    if value is None:
+        return int(time.time())
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.strip())
+    return int(value.timestamp())
+
+
+def format_timestamp(epoch):
+    """Format stored Unix seconds as local "YYYY-MM-DD HH:MM:SS" text."""
+    if epoch is None:
+        return ""
+    return datetime.fromtimestamp(epoch).strftime(TIMESTAMP_FORMAT)
+
+
+class BMIStore:
+    """
+    The BMI database, migrated to the current schema on open.
+
+    All access goes through a ConnectionPool, so one store can be shared by
+    the GUI and worker threads: reads run concurrently on per-thread
+    connections while writes go through the pool's single writer.
+
+    Usage:
+        with BMIStore("bmi_data.db") as store:
+            store.add_record("alice", 62.5, 1.68)
+            rows = store.history("alice")
+    """
+
+    def __init__(self, path=DEFAULT_DB, max_readers=8):
+        self.path = path
+        self.pool = ConnectionPool(path, max_readers)
+
+    def add_record(self, username, weight, height, bmi=None, timestamp=None):
+        """
+        Save one measurement.
+
+        Args:
+            bmi: Precomputed BMI (default: calculate_bmi(weight, height)).
+            timestamp: Anything to_epoch() accepts (default: now).
+
+        Returns:
+            float: The stored BMI.
+        """
+        if bmi is None:
+            bmi = calculate_bmi(weight, height)
+        timestamp = to_epoch(timestamp)
+        self.pool.execute(INSERT_RECORD_SQL, (username, weight, height, bmi, timestamp))
+        return bmi
+
+    def history(self, username):
+        """Return (timestamp, weight, height, bmi) rows for a user, newest first."""
+        return self.pool.query(
+            "SELECT timestamp, weight, height, bmi FROM bmi_records WHERE username=? ORDER BY timestamp DESC",
+            (username,),
+        )
+
+    def history_page(self, username, limit=PAGE_SIZE, after=None, before=None):
+        """
+        Return one page of a user's history, newest first.
+
+        Pages are addressed by keyset rather than OFFSET: each query seeks
+        straight to its position in the (username, timestamp) index, so
+        page 5000 costs the same as page 1.
+
+        Args:
+            limit: Maximum number of rows.
+            after: (timestamp, id) of the last row already shown; return the
+                rows just older than it.
+            before: (timestamp, id) of the first row already shown; return
+                the rows just newer than it.
+
+        Returns:
+            list: (id, timestamp, weight, height, bmi) rows, newest first.
+        """
+        if before is not None:
+            rows = self.pool.query(
+                _PAGE_SQL + " AND (timestamp, id) > (?, ?) ORDER BY timestamp, id LIMIT ?",
+                (username, *before, limit),
+            )
+            rows.reverse()
+            return rows
+        if after is not None:
+            return self.pool.query(
+                _PAGE_SQL + " AND (timestamp, id) < (?, ?) ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (username, *after, limit),
+            )
+        return self.pool.query(_PAGE_SQL + " ORDER BY timestamp DESC, id DESC LIMIT ?", (username, limit))
+
+    def count_records(self, username):
+        """Return how many records a user has (counted on the index alone)."""
+        return self.pool.query_one("SELECT COUNT(*) FROM bmi_records WHERE username=?", (username,))[0]
+
+    def trend(self, username):
+        """Return (timestamp, bmi) rows for a user, oldest first."""
+        return self.pool.query(
+            "SELECT timestamp, bmi FROM bmi_records WHERE username=? ORDER BY timestamp", (username,)
+        )
+
+    def trend_buckets(self, username, buckets):
+        """
+        Return a user's BMI trend reduced to at most `buckets` time buckets.
+
+        The user's time span is cut into equal intervals and each interval is
+        summarised in SQL, so a graph of years of readings transfers only a
+        fixed number of rows.
+
+        Returns:
+            list: (first timestamp, min bmi, max bmi, mean bmi, readings) per
+                non-empty bucket, oldest first.
+        """
+        if buckets < 1:
+            raise ValueError("Number of buckets must be at least 1!")
+        # One connection for all three queries (the helpers reuse it)
+        with self.pool.reader():
+            ends = [self.pool.query_one(
+                f"SELECT timestamp FROM bmi_records WHERE username=? ORDER BY timestamp {order} LIMIT 1",
+                (username,),
+            ) for order in ("ASC", "DESC")]
+            if ends[0] is None:
+                return []
+            start, end = ends[0][0], ends[1][0]
+            width = (end - start) / buckets or 1
+            return self.pool.query(
+                "SELECT MIN(timestamp), MIN(bmi), MAX(bmi), AVG(bmi), COUNT(*) FROM bmi_records "
+                "WHERE username=? GROUP BY MIN(CAST((timestamp - ?) / ? AS INTEGER), ?) "
+                "ORDER BY 1",
+                (username, start, width, buckets - 1),
+            )
+
+    def stats(self, username):
+        """
+        Return a user's summary statistics from the user_stats aggregates.
+
+        Returns:
+            UserStats: Or None if the user has no records.
+        """
+        row = self.pool.query_one(
+            "SELECT count, bmi_sum, bmi_min, bmi_max, latest_timestamp, latest_bmi "
+            "FROM user_stats WHERE username=?",
+            (username,),
+        )
+        if row is None:
+            return None
+        count, total, minimum, maximum, latest_timestamp, latest_bmi = row
+        return UserStats(count, round(total / count, 2), minimum, maximum, latest_timestamp, latest_bmi)
+
+    def range_summary(self, start, end):
+        """
+        Summarise every user's readings taken in [start, end).
+
+        Served by the timestamp index, so the cost follows the size of the
+        range rather than of the table.
+
+        Args:
+            start, end: Anything to_epoch() accepts.
+
+        Returns:
+            tuple: (readings, mean bmi, min bmi, max bmi); the BMI values are
+                None when there are no readings.
+        """
+        return self.pool.query_one(
+            "SELECT COUNT(*), AVG(bmi), MIN(bmi), MAX(bmi) FROM bmi_records "
+            "WHERE timestamp >= ? AND timestamp < ?",
+            (to_epoch(start), to_epoch(end)),
+        )
+
+    def bmis(self, username):
+        """Return every BMI value recorded for a user."""
+        return [row[0] for row in self.pool.iterate(
+            "SELECT bmi FROM bmi_records WHERE username=?", (username,)
+        )]
+
+    def close(self):
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,73 @@
+"""
+Array versions of the BMI functions for whole columns of measurements.
+
+calculate_bmi_array and categorize_array give exactly the same results as
+calculate_bmi and bmi_category applied element by element, but process
+millions of values in a few NumPy operations:
+
+    bmis = calculate_bmi_array(weights, heights)
+    labels = category_labels(categorize_array(bmis))
+"""
+from .logic import BMI_THRESHOLDS, CATEGORIES, CATEGORY_COLORS
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+def _require_numpy():
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("NumPy is required for array BMI functions (pip install numpy)")
+
+
+def calculate_bmi_array(weights, heights):
+    """
+    Compute BMI for arrays of weights (kg) and heights (m), rounded to 2 places.
+
+    Returns:
+        numpy.ndarray: float64 BMIs, equal to calculate_bmi element by element.
+    """
+    _require_numpy()
+    weights = np.asarray(weights, dtype=np.float64)
+    heights = np.asarray(heights, dtype=np.float64)
+    raw = weights / (heights * heights)
+
+    rounded = np.round(raw, 2)
+    # np.round scales by 100 first, which can land on the other side of a
+    # .xx5 tie than Python's correctly rounded round(); redo the few values
+    # that are that close to a tie the scalar way
+    scaled = raw * 100
+    ties = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for i in ties:
+        rounded.flat[i] = round(float(raw.flat[i]), 2)
+    return rounded
+
+
+def categorize_array(bmis):
+    """
+    Bin BMIs into categories.
+
+    Returns:
+        numpy.ndarray: int8 indices into CATEGORIES (0 = Underweight ...
+            3 = Obese), matching bmi_category element by element.
+    """
+    _require_numpy()
+    # side="right" puts a value equal to a threshold in the upper category,
+    # like the scalar `bmi < threshold` checks
+    return np.searchsorted(np.asarray(BMI_THRESHOLDS, dtype=np.float64),
+                           np.asarray(bmis, dtype=np.float64), side="right").astype(np.int8)
+
+
+def category_labels(codes):
+    """Map category indices from categorize_array to their names."""
+    _require_numpy()
+    return np.asarray(CATEGORIES, dtype=object)[codes]
+
+
+def category_colors(codes):
+    """Map category indices from categorize_array to their display colors."""
+    _require_numpy()
+    return np.asarray(CATEGORY_COLORS, dtype=object)[codes]
@@ -0,0 +1,156 @@
+"""
+Background writes with group commit.
+
+A BackgroundWriter writes through a ConnectionPool's writer connection
+from a dedicated thread; pass the pool of the application's BMIStore so the
+process keeps a single writer. Callers queue rows and return immediately;
+the thread takes everything that
+is queued (up to max_batch rows) and writes it in a single transaction, so
+a slow disk costs one commit per batch instead of one per row and never
+blocks the caller.
+
+Completion callbacks are not run on the writer thread. They are queued and
+run by dispatch(), which the owner calls from its own thread - for a Tk
+application, from a root.after() loop, since Tk must only be used from the
+thread running the main loop.
+"""
+import queue
+import sqlite3
+import threading
+
+from .pool import ConnectionPool
+from .storage import DEFAULT_DB, INSERT_RECORD_SQL
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """
+    Insert bmi_records rows on a background thread in group commits.
+
+    Usage:
+        writer = BackgroundWriter(pool=store.pool)
+        writer.submit(("alice", 62.5, 1.68, 22.14, to_epoch()), on_saved)
+        ...
+        writer.dispatch()  # on the UI thread: run callbacks of finished writes
+        writer.close()     # write everything still queued and stop
+    """
+
+    def __init__(self, path=DEFAULT_DB, max_batch=1000, pool=None):
+        """
+        Args:
+            path: Database file; ignored when a pool is given.
+            max_batch: Most rows written in one transaction.
+            pool: ConnectionPool to write through (default: open a private
+                one for `path`, closed again by close()).
+        """
+        if max_batch < 1:
+            raise ValueError("Batch size must be at least 1!")
+        self._owns_pool = pool is None
+        self.pool = ConnectionPool(path) if pool is None else pool
+        self.path = self.pool.path
+        self.max_batch = max_batch
+
+        self._queue = queue.Queue()
+        self._done = queue.Queue()
+        self._closed = False
+
+        self.batches = 0
+        self.written = 0
+
+        self._thread = threading.Thread(target=self._run, name="BMIWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, row, callback=None):
+        """
+        Queue one (username, weight, height, bmi, timestamp) row.
+
+        The timestamp is integer Unix seconds, as returned by to_epoch().
+
+        Args:
+            callback: Optional callback(row, error) run by dispatch() once the
+                row's transaction has committed (error is None) or failed.
+        """
+        if self._closed:
+            raise RuntimeError("Writer is closed!")
+        self._queue.put((row, callback))
+
+    def _run(self):
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            # Group commit: everything that queued up while the previous
+            # transaction was running goes into this one
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+            self._write(batch)
+
+    def _write(self, batch):
+        try:
+            self.pool.executemany(INSERT_RECORD_SQL, [row for row, _ in batch])
+            results = [(item, None) for item in batch]
+            self.written += len(batch)
+        except (sqlite3.Error, RuntimeError):
+            # Retry row by row so one bad row does not fail the rest
+            results = []
+            for item in batch:
+                try:
+                    self.pool.execute(INSERT_RECORD_SQL, item[0])
+                    self.written += 1
+                    results.append((item, None))
+                except (sqlite3.Error, RuntimeError) as e:
+                    results.append((item, e))
+        self.batches += 1
+
+        for (row, callback), error in results:
+            if callback is not None:
+                self._done.put((callback, row, error))
+            self._queue.task_done()
+
+    def dispatch(self):
+        """
+        Run the callbacks of completed writes in the calling thread.
+
+        Returns:
+            int: Number of callbacks run.
+        """
+        count = 0
+        while True:
+            try:
+                callback, row, error = self._done.get_nowait()
+            except queue.Empty:
+                return count
+            callback(row, error)
+            count += 1
+
+    def flush(self):
+        """Block until every queued row has been written."""
+        self._queue.join()
+
+    def close(self):
+        """Write everything still queued, then stop the thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self._owns_pool:
+            self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,61 @@
+"""
+Export BMI records to CSV, JSON Lines or (with pyarrow installed) Parquet.
+
+Records are streamed from the database in batches, so exporting millions
+of rows takes constant memory. CSV and JSON Lines exports can be read back
+with bmi_import.py.
+
+Usage:
+    python bmi_export.py history.csv [--user alice] [--db bmi_data.db]
+                                     [--format csv|jsonl|parquet] [--batch-size 10000]
+"""
+import argparse
+import sqlite3
+import sys
+import time
+
+from bmi_core import DEFAULT_DB, ConnectionPool
+from bmi_core.export import BATCH_SIZE, FORMATS, PYARROW_AVAILABLE, detect_format, export_records
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export BMI records.")
+    parser.add_argument("output", help="file to write")
+    parser.add_argument("--user", help="export only this user (default: everyone)")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"database file (default: {DEFAULT_DB})")
+    parser.add_argument("--format", choices=FORMATS,
+                        help="output format (default: from the file extension, else csv)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"rows fetched at a time (default: {BATCH_SIZE})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    fmt = args.format or detect_format(args.output)
+    if fmt == "parquet" and not PYARROW_AVAILABLE:
+        print("Error: Parquet export needs pyarrow (pip install pyarrow)", file=sys.stderr)
+        sys.exit(2)
+
+    try:
+        pool = ConnectionPool(args.db, max_readers=1)
+    except (RuntimeError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+    try:
+        start = time.perf_counter()
+        count = export_records(pool, args.output, fmt, args.user, args.batch_size)
+        seconds = time.perf_counter() - start
+    except (ValueError, RuntimeError, OSError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+    finally:
+        pool.close()
+
+    rate = count / seconds if seconds else 0.0
+    print(f"Exported {count} records to {args.output} in {seconds:.2f} s ({rate:,.0f} rows/s)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Bulk import of BMI records from CSV, JSON or JSON Lines files.
+
+Each input record needs a username, weight (kg) and height (m); timestamp
+is optional (default: now) and bmi/category, if present, are checked
+against calculate_bmi/bmi_category. For example:
+
+    username,weight,height,timestamp
+    alice,62.5,1.68,2024-03-01 08:15:00
+
+The file is streamed and rows are inserted with executemany in large
+transactions under WAL journal mode, so importing millions of rows takes
+seconds and constant memory instead of one commit per row.
+
+Usage:
+    python bmi_import.py scale_export.csv [--db bmi_data.db] [--batch-size 50000]
+"""
+import argparse
+import csv
+import json
+import math
+import re
+import sqlite3
+import sys
+import time
+
+from bmi_core import DEFAULT_DB, bmi_category, calculate_bmi, connect, to_epoch
+from bmi_core.storage import INSERT_RECORD_SQL
+
+FORMATS = ("csv", "json", "jsonl")
+
+_SEPARATORS = re.compile(r"[\s,]*")
+_EPOCH = re.compile(r"\d+(\.\d*)?")
+
+# Unix seconds of datetime.min and datetime.max (years 1-9999, UTC)
+_MIN_EPOCH = -62_135_596_800
+_MAX_EPOCH = 253_402_300_799
+
+
+def parse_timestamp(value, default=None):
+    """
+    Convert a timestamp to the database's integer Unix seconds.
+
+    Numbers, and text made only of digits such as a CSV "1709280000", are
+    taken as Unix seconds. Other text is ISO 8601 ("2024-03-01 08:15",
+    "2024-03-01T08:15:00+01:00"), local time unless it carries an offset.
+    """
+    if value is None or value == "":
+        if default is None:
+            raise ValueError("missing timestamp")
+        return default
+    if isinstance(value, str) and _EPOCH.fullmatch(value.strip()):
+        value = float(value)
+    # NaN fails both comparisons, so this also rejects NaN and infinity
+    if isinstance(value, (int, float)) and not _MIN_EPOCH <= value <= _MAX_EPOCH:
+        raise ValueError(f"timestamp {value} is out of range")
+    try:
+        return to_epoch(value)
+    except (OverflowError, OSError):
+        raise ValueError(f"timestamp {value} is out of range")
+
+
+def validate_record(record, default_timestamp=None):
+    """
+    Check one input record and turn it into a database row.
+
+    Returns:
+        tuple: (username, weight, height, bmi, timestamp)
+
+    Raises:
+        ValueError: If a field is missing or invalid.
+    """
+    name = str(record.get("username") or "").strip()
+    if not name:
+        raise ValueError("missing username")
+    try:
+        weight = float(record["weight"])
+        height = float(record["height"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("weight and height must be numbers")
+    # NaN slips through every comparison below and would be stored as NULL
+    if not (math.isfinite(weight) and math.isfinite(height)):
+        raise ValueError("weight and height must be finite")
+    if weight <= 0 or height <= 0:
+        raise ValueError("weight and height must be positive")
+    if height > 3:
+        raise ValueError("height must be in meters")
+
+    try:
+        bmi = calculate_bmi(weight, height)
+    except (ZeroDivisionError, OverflowError):
+        bmi = math.inf
+    if not math.isfinite(bmi):
+        raise ValueError("height is too small")
+    given = record.get("bmi")
+    if given not in (None, ""):
+        try:
+            given = float(given)
+        except (TypeError, ValueError):
+            raise ValueError("bmi must be a number")
+        if not math.isfinite(given):
+            raise ValueError("bmi must be finite")
+        if not abs(given - bmi) <= 0.01:
+            raise ValueError(f"bmi {given} does not match weight and height ({bmi})")
+    category = record.get("category")
+    if category and category != bmi_category(bmi):
+        raise ValueError(f"category {category!r} does not match bmi {bmi} ({bmi_category(bmi)})")
+
+    return name, weight, height, bmi, parse_timestamp(record.get("timestamp"), default_timestamp)
+
+
+def _iter_json_array(f, chunk_size=1 << 16):
+    """Yield the elements of a top-level JSON array without loading the whole file."""
+    decoder = json.JSONDecoder()
+    buf = f.read(chunk_size).lstrip()
+    if not buf.startswith("["):
+        raise ValueError("JSON input must be an array of records (use .jsonl for one record per line)")
+    pos = 1
+    while True:
+        pos = _SEPARATORS.match(buf, pos).end()
+        if buf.startswith("]", pos):
+            return
+        try:
+            # Decode in place; slicing the buffer per record would copy it each time
+            obj, pos = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            more = f.read(chunk_size)
+            if not more:
+                raise ValueError("JSON input ended before the closing ]")
+            buf = buf[pos:] + more
+            pos = 0
+            continue
+        yield obj
+
+
+def iter_records(f, fmt):
+    """Yield input records as dicts from an open text file."""
+    if fmt == "csv":
+        yield from csv.DictReader(f)
+    elif fmt == "jsonl":
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+    elif fmt == "json":
+        yield from _iter_json_array(f)
+    else:
+        raise ValueError(f"Unknown input format: {fmt}")
+
+
+def detect_format(path):
+    """Guess the input format from a file name."""
+    lower = path.lower()
+    if lower.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if lower.endswith(".json"):
+        return "json"
+    return "csv"
+
+
+def import_records(conn, records, batch_size=50_000, strict=False, on_error=None):
+    """
+    Validate and insert records in batches of `batch_size` per transaction.
+
+    Args:
+        conn: Open database connection (already migrated).
+        records: Iterable of input dicts.
+        strict: Stop at the first invalid record instead of skipping it.
+        on_error: Optional callback(record_number, message) for skipped rows.
+
+    Returns:
+        tuple: (rows imported, rows skipped)
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1!")
+    now = to_epoch()
+    imported = skipped = 0
+    batch = []
+
+    def flush():
+        with conn:
+            conn.executemany(INSERT_RECORD_SQL, batch)
+        batch.clear()
+
+    for number, record in enumerate(records, 1):
+        try:
+            batch.append(validate_record(record, now))
+        except (ValueError, AttributeError) as e:
+            if strict:
+                raise ValueError(f"record {number}: {e}")
+            skipped += 1
+            if on_error is not None:
+                on_error(number, str(e))
+            continue
+        if len(batch) >= batch_size:
+            imported += len(batch)
+            flush()
+    if batch:
+        imported += len(batch)
+        flush()
+    return imported, skipped
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Import BMI records from CSV, JSON or JSON Lines.")
+    parser.add_argument("file", help="file to import (- for stdin)")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"database file (default: {DEFAULT_DB})")
+    parser.add_argument("--format", choices=FORMATS,
+                        help="input format (default: from the file extension, else csv)")
+    parser.add_argument("--batch-size", type=int, default=50_000,
+                        help="rows per transaction (default: 50000)")
+    parser.add_argument("--strict", action="store_true", help="abort on the first invalid record")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    fmt = args.format or ("csv" if args.file == "-" else detect_format(args.file))
+
+    shown = 0
+
+    def report(number, message):
+        # Show the first few problems; the total is printed at the end
+        nonlocal shown
+        if shown < 10:
+            print(f"Skipping record {number}: {message}", file=sys.stderr)
+            shown += 1
+
+    try:
+        conn = connect(args.db)
+    except (RuntimeError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+    try:
+        # WAL lets the GUI keep reading while a long import is running, and
+        # synchronous=NORMAL is safe with WAL and much faster for bulk writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # A larger page cache keeps more of the (username, timestamp) index
+        # in memory while rows arrive in arbitrary order
+        conn.execute("PRAGMA cache_size=-65536")
+        f = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8", newline="")
+        try:
+            start = time.perf_counter()
+            imported, skipped = import_records(conn, iter_records(f, fmt), args.batch_size,
+                                               args.strict, report)
+            seconds = time.perf_counter() - start
+        finally:
+            if f is not sys.stdin:
+                f.close()
+    except (ValueError, OSError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+    finally:
+        conn.close()
+
+    rate = imported / seconds if seconds else 0.0
+    print(f"Imported {imported} records in {seconds:.2f} s ({rate:,.0f} rows/s), skipped {skipped}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Maintenance commands for the BMI database.
+
+Usage:
+    python bmi_maintenance.py migrate [--db bmi_data.db]
+    python bmi_maintenance.py rebuild-stats [--db bmi_data.db]
+"""
+import argparse
+import sqlite3
+import sys
+import time
+
+from bmi_core import DEFAULT_DB, SCHEMA_VERSION, migrate, rebuild_user_stats
+
+
+def run_migrate(conn):
+    """Apply pending schema migrations and list them."""
+    applied = migrate(conn)
+    for description in applied:
+        print(f"Applied: {description}")
+    print(f"Schema is at version {SCHEMA_VERSION}")
+
+
+def run_rebuild_stats(conn):
+    """Recompute the per-user statistics aggregates from bmi_records."""
+    migrate(conn)
+    start = time.perf_counter()
+    with conn:
+        users = rebuild_user_stats(conn)
+    print(f"Rebuilt statistics for {users} users in {time.perf_counter() - start:.2f} s")
+
+
+COMMANDS = {
+    "migrate": run_migrate,
+    "rebuild-stats": run_rebuild_stats,
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the BMI database.")
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"database file (default: {DEFAULT_DB})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    conn = sqlite3.connect(args.db)
+    try:
+        COMMANDS[args.command](conn)
+    except (RuntimeError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
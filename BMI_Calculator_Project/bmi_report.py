@@ -0,0 +1,236 @@
+"""
+Population-wide BMI reports, computed in SQL and streamed to CSV or JSON.
+
+Reports:
+    categories  readings per BMI category, and users by the category of
+                their latest reading
+    users       every user's reading count, average/min/max and latest BMI
+    monthly     readings, users and average/min/max BMI per calendar month,
+                with the number of readings in each category
+
+All aggregation is done by SQLite GROUP BY queries and the result rows are
+read from the cursor in batches and written out as they arrive, so memory
+use stays flat however many records the database holds.
+
+Usage:
+    python bmi_report.py monthly [--db bmi_data.db] [--format csv|json] [--output FILE]
+                                 [--since 2024-01-01] [--until 2025-01-01]
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+
+from bmi_core import DEFAULT_DB, ConnectionPool, bmi_category, format_timestamp, to_epoch
+from bmi_core.logic import BMI_THRESHOLDS, CATEGORIES
+
+FORMATS = ("csv", "json")
+
+# Rows fetched from the cursor at a time
+BATCH_SIZE = 10_000
+
+
+def category_case(column):
+    """Return an SQL expression giving bmi_category() of `column`."""
+    whens = " ".join(f"WHEN {column} < {limit} THEN '{label}'"
+                     for limit, label in zip(BMI_THRESHOLDS, CATEGORIES))
+    return f"CASE {whens} ELSE '{CATEGORIES[-1]}' END"
+
+
+def range_filter(since, until, *conditions):
+    """
+    Return a WHERE clause on timestamp and its parameters (None bounds are open).
+
+    Args:
+        conditions: Extra SQL conditions to AND with the range.
+    """
+    clauses, params = list(conditions), []
+    if since is not None:
+        clauses.append("timestamp >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append("timestamp < ?")
+        params.append(until)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def latest_readings_sql(since, until):
+    """
+    Return SQL and parameters for (username, readings, bmi sum, min, max,
+    latest timestamp, latest bmi) per user.
+
+    Without a date range this reads the user_stats aggregates; with one it
+    aggregates the matching bmi_records. Either way the columns are named
+    like user_stats, so callers can select from the result by name.
+    """
+    if since is None and until is None:
+        return ("SELECT username, count, bmi_sum, bmi_min, bmi_max, latest_timestamp, latest_bmi "
+                "FROM user_stats"), []
+    where, params = range_filter(since, until)
+    latest_where, latest_params = range_filter(since, until, "r.username = g.username")
+    return (
+        "SELECT username, COUNT(*) AS count, SUM(bmi) AS bmi_sum, MIN(bmi) AS bmi_min, "
+        "MAX(bmi) AS bmi_max, MAX(timestamp) AS latest_timestamp, "
+        f"(SELECT bmi FROM bmi_records AS r{latest_where} ORDER BY timestamp DESC, id DESC LIMIT 1) "
+        f"AS latest_bmi FROM bmi_records AS g{where} GROUP BY username"
+    ), latest_params + params
+
+
+def report_categories(pool, since=None, until=None):
+    """
+    Report readings and users (by their latest reading) per category.
+
+    Returns:
+        tuple: (column names, row generator)
+    """
+    where, params = range_filter(since, until)
+    readings = dict(pool.iterate(
+        f"SELECT {category_case('bmi')}, COUNT(*) FROM bmi_records{where} GROUP BY 1", params
+    ))
+    latest_sql, latest_params = latest_readings_sql(since, until)
+    users = dict(pool.iterate(
+        f"SELECT {category_case('latest')}, COUNT(*) FROM "
+        f"(SELECT latest_bmi AS latest FROM ({latest_sql})) GROUP BY 1",
+        latest_params,
+    ))
+    total_readings = sum(readings.values())
+    total_users = sum(users.values())
+
+    def rows():
+        for category in CATEGORIES:
+            count, people = readings.get(category, 0), users.get(category, 0)
+            yield (category, count, round(count / total_readings, 4) if total_readings else 0.0,
+                   people, round(people / total_users, 4) if total_users else 0.0)
+
+    return ("category", "readings", "readings_share", "users", "users_share"), rows()
+
+
+def report_users(pool, since=None, until=None):
+    """
+    Report every user's reading count, average/min/max and latest BMI.
+
+    Returns:
+        tuple: (column names, row generator)
+    """
+    sql, params = latest_readings_sql(since, until)
+    cursor = pool.iterate(sql + " ORDER BY username", params, BATCH_SIZE)
+
+    def rows():
+        for username, count, total, minimum, maximum, latest_timestamp, latest_bmi in cursor:
+            yield (username, count, round(total / count, 2), minimum, maximum,
+                   format_timestamp(latest_timestamp), latest_bmi, bmi_category(latest_bmi))
+
+    return ("username", "readings", "average_bmi", "min_bmi", "max_bmi",
+            "latest_timestamp", "latest_bmi", "latest_category"), rows()
+
+
+def report_monthly(pool, since=None, until=None):
+    """
+    Report each calendar month (local time) that has readings.
+
+    Returns:
+        tuple: (column names, row generator)
+    """
+    where, params = range_filter(since, until)
+    per_category = ", ".join(f"SUM(category = '{label}')" for label in CATEGORIES)
+    sql = (
+        "SELECT month, COUNT(*), COUNT(DISTINCT username), ROUND(AVG(bmi), 2), MIN(bmi), MAX(bmi), "
+        f"{per_category} FROM ("
+        "SELECT strftime('%Y-%m', timestamp, 'unixepoch', 'localtime') AS month, username, bmi, "
+        f"{category_case('bmi')} AS category FROM bmi_records{where}"
+        ") GROUP BY month ORDER BY month"
+    )
+    columns = ("month", "readings", "users", "average_bmi", "min_bmi", "max_bmi",
+               *(label.lower() for label in CATEGORIES))
+    return columns, pool.iterate(sql, params, BATCH_SIZE)
+
+
+REPORTS = {
+    "categories": report_categories,
+    "users": report_users,
+    "monthly": report_monthly,
+}
+
+
+def write_csv(f, columns, rows):
+    """Write a header and the rows as CSV, one row at a time."""
+    writer = csv.writer(f)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_json(f, columns, rows):
+    """Write the rows as a JSON array of objects, one object per line."""
+    f.write("[")
+    count = 0
+    for row in rows:
+        f.write(",\n" if count else "\n")
+        f.write(json.dumps(dict(zip(columns, row))))
+        count += 1
+    f.write("\n]\n")
+    return count
+
+
+WRITERS = {"csv": write_csv, "json": write_json}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Report on every user's BMI records.")
+    parser.add_argument("report", choices=REPORTS)
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"database file (default: {DEFAULT_DB})")
+    parser.add_argument("--format", choices=FORMATS, default="csv", help="output format (default: csv)")
+    parser.add_argument("--output", "-o", help="output file (default: stdout)")
+    parser.add_argument("--since", help="only readings at or after this date/time")
+    parser.add_argument("--until", help="only readings before this date/time")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        since = None if args.since is None else to_epoch(args.since)
+        until = None if args.until is None else to_epoch(args.until)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    try:
+        pool = ConnectionPool(args.db, max_readers=1)
+    except (RuntimeError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+    rows = None
+    try:
+        columns, rows = REPORTS[args.report](pool, since, until)
+        f = sys.stdout if args.output is None else open(args.output, "w", encoding="utf-8", newline="")
+        try:
+            count = WRITERS[args.format](f, columns, rows)
+        finally:
+            if f is not sys.stdout:
+                f.close()
+    except BrokenPipeError:
+        # Output piped into e.g. head, which has stopped reading; keep the
+        # interpreter from complaining again when it flushes stdout on exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+    finally:
+        # Release the cursor before its connection is closed
+        if rows is not None:
+            rows.close()
+        pool.close()
+
+    if args.output is not None:
+        print(f"Wrote {count} rows to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,53 +1,127 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
 import sqlite3
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from collections import deque
 from datetime import datetime
-import matplotlib.pyplot as plt
-
-# ---------------- DATABASE ----------------
-conn = sqlite3.connect("bmi_data.db")
-cur = conn.cursor()
-
-cur.execute("""
-CREATE TABLE IF NOT EXISTS bmi_records (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    username TEXT,
-    weight REAL,
-    height REAL,
-    bmi REAL,
-    timestamp TEXT
-)
-""")
-conn.commit()
-
-# ---------------- BMI LOGIC ----------------
-def calculate_bmi(weight, height):
-    return round(weight / (height ** 2), 2)
-
-def bmi_category(bmi):
-    if bmi < 18.5:
-        return "Underweight"
-    elif bmi < 25:
-        return "Normal"
-    elif bmi < 30:
-        return "Overweight"
-    else:
-        return "Obese"
-
-def get_bmi_color(bmi):
-    if bmi < 18.5:
-        return "#4A90E2"  # Blue for underweight
-    elif bmi < 25:
-        return "#2ECC71"  # Green for normal
-    elif bmi < 30:
-        return "#F39C12"  # Orange for overweight
-    else:
-        return "#E74C3C"  # Red for obese
+
+from bmi_core import (PAGE_SIZE, BackgroundWriter, BMIStore, calculate_bmi, bmi_category,
+                      format_timestamp, get_bmi_color, to_epoch)
+
+# Most points drawn in the trend graph; longer histories are bucketed
+GRAPH_POINTS = 1000
+
+# How often the UI picks up finished background writes (ms)
+WRITER_POLL_MS = 50
 
 # ---------------- GUI APP ----------------
+class PagedHistory:
+    """
+    Feeds a history Treeview from the database one page at a time.
+
+    Only WINDOW_PAGES pages are kept in the widget: scrolling near the bottom
+    loads the next older page and drops the top one, scrolling near the top
+    brings newer pages back, so the window stays responsive and small however
+    long the history is.
+    """
+
+    WINDOW_PAGES = 3
+
+    def __init__(self, tree, scrollbar, store, username, page_size=PAGE_SIZE, on_change=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.store = store
+        self.username = username
+        self.page_size = page_size
+        self.on_change = on_change
+
+        self.keys = deque()  # (timestamp, id) of each row in the widget, top to bottom
+        self.offset = 0      # rows above the window that were dropped
+        self.at_end = False  # the oldest record is in the widget
+        self._busy = False
+
+        tree.configure(yscrollcommand=self.on_scroll)
+        self._append(store.history_page(username, page_size))
+        self._changed()
+
+    def _insert(self, index, row):
+        record_id, timestamp, weight, height, bmi = row
+        self.tree.insert("", index, iid=str(record_id), values=(
+            format_timestamp(timestamp), f"{weight:.2f}", f"{height:.2f}", f"{bmi:.2f}", bmi_category(bmi)
+        ))
+
+    def _append(self, rows):
+        for row in rows:
+            self._insert("end", row)
+            self.keys.append((row[1], row[0]))
+        if len(rows) < self.page_size:
+            self.at_end = True
+
+    def _drop(self, count, from_top):
+        take = self.keys.popleft if from_top else self.keys.pop
+        self.tree.delete(*[str(take()[1]) for _ in range(count)])
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change(self.offset + 1, self.offset + len(self.keys))
+
+    def on_scroll(self, first, last):
+        """yscrollcommand: update the scrollbar and load pages near either end."""
+        self.scrollbar.set(first, last)
+        if self._busy or not self.keys:
+            return
+        if float(last) > 0.9 and not self.at_end:
+            self._busy = True
+            self.tree.after_idle(self.load_older)
+        elif float(first) < 0.1 and self.offset:
+            self._busy = True
+            self.tree.after_idle(self.load_newer)
+
+    def load_older(self):
+        """Append the next older page, dropping rows from the top if the window is full."""
+        try:
+            rows = self.store.history_page(self.username, self.page_size, after=self.keys[-1])
+            if not rows:
+                self.at_end = True
+                return
+            top_row = self.tree.yview()[0] * len(self.keys)
+            self._append(rows)
+            excess = len(self.keys) - self.WINDOW_PAGES * self.page_size
+            if excess > 0:
+                self._drop(excess, from_top=True)
+                self.offset += excess
+                top_row -= excess
+            # Keep the rows the user was looking at in place
+            self.tree.yview_moveto(max(top_row, 0) / len(self.keys))
+            self._changed()
+        finally:
+            self._busy = False
+
+    def load_newer(self):
+        """Prepend the next newer page, dropping rows from the bottom if the window is full."""
+        try:
+            rows = self.store.history_page(self.username, self.page_size, before=self.keys[0])
+            top_row = self.tree.yview()[0] * len(self.keys)
+            for row in reversed(rows):
+                self._insert(0, row)
+                self.keys.appendleft((row[1], row[0]))
+            self.offset = 0 if len(rows) < self.page_size else max(self.offset - len(rows), 0)
+            top_row += len(rows)
+            excess = len(self.keys) - self.WINDOW_PAGES * self.page_size
+            if excess > 0:
+                self._drop(excess, from_top=False)
+                self.at_end = False
+            self.tree.yview_moveto(top_row / len(self.keys))
+            self._changed()
+        finally:
+            self._busy = False
+
+
 class BMICalculator:
-    def __init__(self, root):
+    def __init__(self, root, store, writer):
         self.root = root
+        self.store = store
+        self.writer = writer
         self.root.title("BMI Calculator - Health Tracker (Made by Not_Omkar)")
         self.root.geometry("700x650")
         self.root.minsize(600, 500)  # Minimum window size
@@ -65,11 +139,20 @@ class BMICalculator:
         self.style.configure('Custom.TButton', font=('Segoe UI', 10, 'bold'), padding=10)
         self.style.configure('Action.TButton', font=('Segoe UI', 11, 'bold'), padding=(15, 10))
 
+        # The graph window is created on first use and then reused
+        self.graph_win = None
+        self.graph_figure = None
+        self.graph_canvas = None
+
         self.create_widgets()
+        self.create_menu()
         
         # Bind window resize event to update fonts if needed
         self.root.bind('<Configure>', self.on_window_resize)
 
+        # Deliver completed saves from the writer thread on the Tk thread
+        self.root.after(WRITER_POLL_MS, self.poll_writer)
+
     def create_widgets(self):
         # Main container with padding - using grid for better control
         main_frame = tk.Frame(self.root, bg="#F5F5F5")
@@ -292,6 +375,16 @@ class BMICalculator:
             btn.bind('<Enter>', lambda e, c=color, b=btn: b.config(bg=self.darken_color(c)))
             btn.bind('<Leave>', lambda e, c=color, b=btn: b.config(bg=c))
 
+    def create_menu(self):
+        menubar = tk.Menu(self.root)
+        file_menu = tk.Menu(menubar, tearoff=0)
+        file_menu.add_command(label="Export My History...", command=self.export_history)
+        file_menu.add_command(label="Export All Users...", command=lambda: self.export_history(all_users=True))
+        file_menu.add_separator()
+        file_menu.add_command(label="Exit", command=self.root.destroy)
+        menubar.add_cascade(label="File", menu=file_menu)
+        self.root.config(menu=menubar)
+
     def on_window_resize(self, event):
         """Handle window resize events"""
         if event.widget == self.root:
@@ -359,15 +452,8 @@ class BMICalculator:
                 font=('Segoe UI', 12)
             )
 
-            # Save to database
-            cur.execute(
-                "INSERT INTO bmi_records VALUES (NULL, ?, ?, ?, ?, ?)",
-                (name, weight, height, bmi, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-            )
-            conn.commit()
-
-            # Show success message
-            messagebox.showinfo("Success", f"BMI calculated and saved!\n\nBMI: {bmi}\nCategory: {category}")
+            # Save in the background; the message appears once it is committed
+            self.writer.submit((name, weight, height, bmi, to_epoch()), self.on_saved)
 
         except ValueError as e:
             if "could not convert" in str(e).lower():
@@ -377,12 +463,32 @@ class BMICalculator:
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
 
+    def on_saved(self, row, error):
+        """Report a background save (called on the Tk thread by poll_writer)."""
+        if error is not None:
+            messagebox.showerror("Error", f"Could not save your BMI: {error}")
+            return
+        bmi = row[3]
+        messagebox.showinfo("Success", f"BMI calculated and saved!\n\nBMI: {bmi}\nCategory: {bmi_category(bmi)}")
+
+    def poll_writer(self):
+        self.writer.dispatch()
+        self.root.after(WRITER_POLL_MS, self.poll_writer)
+
     def show_history(self):
         name = self.username.get().strip()
         if not name:
             messagebox.showwarning("Warning", "Please enter your name first to view history.")
             return
 
+        # Include saves that are still queued
+        self.writer.flush()
+
+        total = self.store.count_records(name)
+        if not total:
+            messagebox.showinfo("No Data", f"No BMI records found for {name}.")
+            return
+
         win = tk.Toplevel(self.root)
         win.title(f"BMI History - {name}")
         win.geometry("750x500")
@@ -406,6 +512,15 @@ class BMICalculator:
             fg="white"
         ).pack()
 
+        position_label = tk.Label(
+            header,
+            text="",
+            font=('Segoe UI', 9),
+            bg="#34495E",
+            fg="#BDC3C7"
+        )
+        position_label.pack(pady=(4, 0))
+
         # Treeview with scrollbar
         container = tk.Frame(win, bg="#F5F5F5")
         container.grid(row=1, column=0, sticky="nsew", padx=20, pady=20)
@@ -417,7 +532,7 @@ class BMICalculator:
         scrollbar.grid(row=0, column=1, sticky="ns")
 
         cols = ("Date & Time", "Weight (kg)", "Height (m)", "BMI", "Category")
-        tree = ttk.Treeview(container, columns=cols, show="headings", yscrollcommand=scrollbar.set)
+        tree = ttk.Treeview(container, columns=cols, show="headings")
         scrollbar.config(command=tree.yview)
 
         # Configure columns with proportional widths
@@ -451,22 +566,58 @@ class BMICalculator:
         
         win.bind('<Configure>', resize_columns)
 
-        # Fetch and display data
-        cur.execute(
-            "SELECT timestamp, weight, height, bmi FROM bmi_records WHERE username=? ORDER BY timestamp DESC",
-            (name,)
-        )
-        rows = cur.fetchall()
+        # Rows are fetched page by page as the user scrolls
+        def show_position(first, last):
+            position_label.config(text=f"Showing {first:,}-{last:,} of {total:,} records")
 
-        if not rows:
-            messagebox.showinfo("No Data", f"No BMI records found for {name}.")
-            win.destroy()
+        win.history = PagedHistory(tree, scrollbar, self.store, name, on_change=show_position)
+
+    def export_history(self, all_users=False):
+        name = self.username.get().strip()
+        if not all_users and not name:
+            messagebox.showwarning("Warning", "Please enter your name first to export your history.")
             return
 
-        for row in rows:
-            timestamp, weight, height, bmi = row
-            category = bmi_category(bmi)
-            tree.insert("", "end", values=(timestamp, f"{weight:.2f}", f"{height:.2f}", f"{bmi:.2f}", category))
+        # Loaded on first use, like matplotlib; pyarrow is optional
+        from bmi_core.export import PYARROW_AVAILABLE, export_records
+
+        filetypes = [("CSV", "*.csv"), ("JSON Lines", "*.jsonl")]
+        if PYARROW_AVAILABLE:
+            filetypes.append(("Parquet", "*.parquet"))
+        path = filedialog.asksaveasfilename(
+            title="Export BMI Records",
+            defaultextension=".csv",
+            filetypes=filetypes,
+            initialfile="bmi_all_users.csv" if all_users else f"bmi_{name}.csv",
+        )
+        if not path:
+            return
+
+        # Include saves that are still queued
+        self.writer.flush()
+
+        # Large exports run on a worker thread with their own pooled
+        # connection; the result is picked up on the Tk thread
+        result = {}
+
+        def run():
+            try:
+                result["count"] = export_records(self.store.pool, path, username=None if all_users else name)
+            except (ValueError, RuntimeError, OSError, sqlite3.Error) as e:
+                result["error"] = e
+
+        worker = threading.Thread(target=run, name="BMIExport", daemon=True)
+        worker.start()
+
+        def check():
+            if worker.is_alive():
+                self.root.after(WRITER_POLL_MS, check)
+            elif "error" in result:
+                messagebox.showerror("Export Failed", f"Could not export records: {result['error']}")
+            else:
+                messagebox.showinfo("Export Complete", f"Exported {result['count']} records to\n{path}")
+
+        check()
 
     def show_graph(self):
         name = self.username.get().strip()
@@ -474,35 +625,78 @@ class BMICalculator:
             messagebox.showwarning("Warning", "Please enter your name first to view graph.")
             return
 
-        cur.execute(
-            "SELECT timestamp, bmi FROM bmi_records WHERE username=? ORDER BY timestamp",
-            (name,)
-        )
-        data = cur.fetchall()
+        # Include saves that are still queued
+        self.writer.flush()
+
+        total = self.store.count_records(name)
 
-        if not data:
+        if not total:
             messagebox.showinfo("No Data", f"No BMI records found for {name}.")
             return
 
-        dates = [d[0] for d in data]
-        bmis = [d[1] for d in data]
+        # Long histories are reduced in SQL to min/mean/max per time bucket
+        # so the graph never draws more than GRAPH_POINTS points
+        if total <= GRAPH_POINTS:
+            rows = self.store.trend(name)
+            dates = [datetime.fromtimestamp(ts) for ts, _ in rows]
+            bmis = [bmi for _, bmi in rows]
+            band = None
+        else:
+            rows = self.store.trend_buckets(name, GRAPH_POINTS)
+            dates = [datetime.fromtimestamp(row[0]) for row in rows]
+            bmis = [row[3] for row in rows]
+            band = ([row[1] for row in rows], [row[2] for row in rows])
+
+        figure, canvas = self.graph_window()
+        ax = figure.axes[0] if figure.axes else figure.add_subplot()
+        ax.clear()
+
+        if band is None:
+            ax.plot(dates, bmis, marker="o", linewidth=2, markersize=8 if total <= 100 else 3, color="#3498DB")
+        else:
+            ax.fill_between(dates, band[0], band[1], color="#3498DB", alpha=0.2, linewidth=0,
+                            label="Range")
+            ax.plot(dates, bmis, linewidth=1.5, color="#3498DB", label="Average")
+        ax.set_title(f"BMI Trend Over Time - {name} ({total:,} records)", fontsize=14, fontweight='bold', pad=20)
+        ax.set_xlabel("Date", fontsize=11)
+        ax.set_ylabel("BMI", fontsize=11)
+        ax.grid(True, alpha=0.3, linestyle='--')
 
-        plt.figure(figsize=(10, 6))
-        plt.plot(dates, bmis, marker="o", linewidth=2, markersize=8, color="#3498DB")
-        plt.xticks(rotation=45, ha='right')
-        plt.title(f"BMI Trend Over Time - {name}", fontsize=14, fontweight='bold', pad=20)
-        plt.xlabel("Date", fontsize=11)
-        plt.ylabel("BMI", fontsize=11)
-        plt.grid(True, alpha=0.3, linestyle='--')
-        
         # Add category reference lines
-        plt.axhline(y=18.5, color='#4A90E2', linestyle='--', alpha=0.5, label='Underweight threshold')
-        plt.axhline(y=25, color='#2ECC71', linestyle='--', alpha=0.5, label='Normal threshold')
-        plt.axhline(y=30, color='#F39C12', linestyle='--', alpha=0.5, label='Overweight threshold')
-        
-        plt.legend(loc='best')
-        plt.tight_layout()
-        plt.show()
+        ax.axhline(y=18.5, color='#4A90E2', linestyle='--', alpha=0.5, label='Underweight threshold')
+        ax.axhline(y=25, color='#2ECC71', linestyle='--', alpha=0.5, label='Normal threshold')
+        ax.axhline(y=30, color='#F39C12', linestyle='--', alpha=0.5, label='Overweight threshold')
+
+        ax.legend(loc='best')
+        figure.autofmt_xdate(rotation=45, ha='right')
+        figure.tight_layout()
+        canvas.draw_idle()
+
+        self.graph_win.title(f"BMI Trend - {name}")
+        self.graph_win.deiconify()
+        self.graph_win.lift()
+
+    def graph_window(self):
+        """Return the (figure, canvas) of the graph window, creating it on first use."""
+        if self.graph_win is not None and self.graph_win.winfo_exists():
+            return self.graph_figure, self.graph_canvas
+
+        # matplotlib takes hundreds of ms to import, so only load it when a
+        # graph is actually requested
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+
+        self.graph_win = tk.Toplevel(self.root)
+        self.graph_win.geometry("900x600")
+        self.graph_win.minsize(600, 400)
+        # Closing only hides the window, so the next graph reuses the canvas
+        self.graph_win.protocol("WM_DELETE_WINDOW", self.graph_win.withdraw)
+
+        self.graph_figure = Figure(figsize=(10, 6))
+        self.graph_canvas = FigureCanvasTkAgg(self.graph_figure, master=self.graph_win)
+        NavigationToolbar2Tk(self.graph_canvas, self.graph_win).update()
+        self.graph_canvas.get_tk_widget().pack(fill="both", expand=True)
+        return self.graph_figure, self.graph_canvas
 
     def show_stats(self):
         name = self.username.get().strip()
@@ -510,20 +704,20 @@ class BMICalculator:
             messagebox.showwarning("Warning", "Please enter your name first to view statistics.")
             return
 
-        cur.execute(
-            "SELECT bmi FROM bmi_records WHERE username=?",
-            (name,)
-        )
-        bmis = [row[0] for row in cur.fetchall()]
+        # Include saves that are still queued
+        self.writer.flush()
 
-        if not bmis:
+        # One-row lookup in the user_stats aggregates
+        stats = self.store.stats(name)
+
+        if stats is None:
             messagebox.showinfo("No Data", f"No BMI records found for {name}.")
             return
 
-        avg_bmi = round(sum(bmis) / len(bmis), 2)
-        min_bmi = min(bmis)
-        max_bmi = max(bmis)
-        latest_bmi = bmis[-1]
+        avg_bmi = stats.average
+        min_bmi = stats.minimum
+        max_bmi = stats.maximum
+        latest_bmi = stats.latest_bmi
         latest_category = bmi_category(latest_bmi)
         
         # Create a nice stats window
@@ -573,7 +767,7 @@ class BMICalculator:
         scrollbar_stats.grid(row=0, column=1, sticky="ns")
 
         stats_data = [
-            ("Total Records", f"{len(bmis)}", "#3498DB"),
+            ("Total Records", f"{stats.count}", "#3498DB"),
             ("Latest BMI", f"{latest_bmi:.2f} ({latest_category})", get_bmi_color(latest_bmi)),
             ("Average BMI", f"{avg_bmi:.2f}", "#9B59B6"),
             ("Minimum BMI", f"{min_bmi:.2f}", "#16A085"),
@@ -617,7 +811,14 @@ class BMICalculator:
         canvas.bind_all("<MouseWheel>", _on_mousewheel)
 
 # ---------------- RUN APP ----------------
-root = tk.Tk()
-app = BMICalculator(root)
-root.mainloop()
-conn.close()
+def main():
+    # Creates the database on first run and applies pending schema migrations.
+    # Closing the writer on the way out commits any saves still queued.
+    with BMIStore() as store, BackgroundWriter(pool=store.pool) as writer:
+        root = tk.Tk()
+        app = BMICalculator(root, store, writer)
+        root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,37 @@
+import argparse
+import csv
+import json
+import os
 import random
+import secrets
 import string
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
 
+from breach_check import BreachChecker
+from passphrase import WordList, generate_passphrases
+from password_dedup import BloomFilter
+from password_strength import RATINGS, iter_file_passwords, score_passwords, write_scores
+from seeded_random import SEED_BLOCK, CounterRandom, seeded_bytes
 
-def generate_password(length, use_letters=True, use_digits=True, use_symbols=True):
-   
+# NumPy is optional; it is only needed to return batches as arrays
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+def build_charset(use_letters=True, use_digits=True, use_symbols=True):
+    """
+    Build the character set for the selected character types.
+    
+    Returns:
+        str: The characters a password may be drawn from.
+    """
     characters = ""
     
     if use_letters:
@@ -18,16 +45,946 @@ def generate_password(length, use_letters=True, use_digits=True, use_symbols=Tru
     if not characters:
         raise ValueError("At least one character type must be selected!")
     
+    return characters
+
+
+def generate_password(length, use_letters=True, use_digits=True, use_symbols=True,
+                      breach_checker=None, rng=None):
+   
+    characters = build_charset(use_letters, use_digits, use_symbols)
+    
     # Ensure minimum length
     if length < 1:
         raise ValueError("Password length must be at least 1!")
     
-    # Generate password using random.choices for better randomness
-    password = ''.join(random.choices(characters, k=length))
+    # An explicit generator (anything with randbytes, e.g. CounterRandom or
+    # random.Random) keeps its state to the caller instead of the global one
+    if rng is not None:
+        def draw():
+            return random_characters(characters, length, rng.randbytes).decode("ascii")
+    else:
+        # Generate password using random.choices for better randomness
+        def draw():
+            return ''.join(random.choices(characters, k=length))
+    password = draw()
+    
+    # Optionally regenerate until the password is not in a known breach
+    if breach_checker is not None:
+        for _ in range(100):
+            if password not in breach_checker:
+                return password
+            password = draw()
+        raise RuntimeError("Could not generate a password outside the breach corpus!")
     
     return password
 
 
+def _build_translation(alphabet):
+    """
+    Build a byte translation table and the set of rejected bytes for an alphabet.
+    
+    Byte values below the largest multiple of len(alphabet) map onto
+    alphabet[value % len(alphabet)]; the remaining values are rejected so
+    every character is equally likely (no modulo bias).
+    
+    Returns:
+        tuple: (table, rejected, acceptance) for use with bytes.translate
+    """
+    size = len(alphabet)
+    if not 1 <= size <= 256:
+        raise ValueError("Alphabet must contain between 1 and 256 characters!")
+    try:
+        encoded = alphabet.encode("ascii")
+    except UnicodeEncodeError:
+        raise ValueError("Alphabet must contain only ASCII characters!")
+    
+    limit = 256 - (256 % size)
+    table = bytes(encoded[value % size] for value in range(256))
+    rejected = bytes(range(limit, 256))
+    return table, rejected, limit / 256
+
+
+def random_characters(alphabet, total, randbytes=secrets.token_bytes):
+    """
+    Draw `total` uniformly distributed characters from `alphabet`.
+    
+    Random bytes are taken from `randbytes` in large buffers and mapped onto
+    the alphabet with rejection sampling, all at C speed via bytes.translate.
+    
+    Returns:
+        bytes: `total` ASCII characters from the alphabet.
+    """
+    table, rejected, acceptance = _build_translation(alphabet)
+    # Over-draw slightly so one buffer is almost always enough
+    data = randbytes(int(total / acceptance) + 64).translate(table, rejected)
+    if len(data) >= total:
+        return data[:total] if len(data) > total else data
+    
+    chunks = [data]
+    filled = len(data)
+    while filled < total:
+        needed = total - filled
+        chunk = randbytes(int(needed / acceptance) + 64).translate(table, rejected)[:needed]
+        chunks.append(chunk)
+        filled += len(chunk)
+    return b"".join(chunks)
+
+
+class _BatchSource:
+    """
+    Shared batch API for password sources.
+    
+    Subclasses set `length` and `combinations` (number of distinct passwords
+    they can produce) and implement generate_bytes(count, randbytes), which
+    returns `count` fixed-width passwords packed back to back.
+    """
+    
+    def generate(self):
+        """Generate a single password."""
+        return self.generate_bytes(1).decode("ascii")
+    
+    def generate_batch(self, count, as_array=False, workers=None, unique=False,
+                       breach_checker=None, seed=None, start=0):
+        """
+        Generate `count` passwords.
+        
+        Args:
+            as_array: Return a NumPy array of fixed-width bytes (dtype S<length>)
+                instead of a list of strings. Requires NumPy.
+            workers: Number of processes to shard the batch across. None or 1
+                generates in the current process.
+            unique: Guarantee that no password appears twice in the batch.
+                Duplicates are rejected during generation by a Bloom filter
+                (see password_dedup for its memory use and error rate).
+            breach_checker: Optional BreachChecker; passwords found in its
+                breach corpus are rejected and replaced.
+            seed: Generate a reproducible batch from this int, str or bytes
+                seed instead of the system CSPRNG (see seeded_random).
+            start: With a seed, index of the first password in the seed's
+                sequence, so any slice can be regenerated on its own.
+        
+        Returns:
+            list: `count` passwords (or a NumPy array when as_array is True).
+        """
+        if count < 0:
+            raise ValueError("Password count cannot be negative!")
+        
+        if as_array and not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy is required for as_array=True (pip install numpy)")
+        
+        length = self.length
+        # Work in blocks of about 1 MB so the raw bytes and decoded text of
+        # the whole batch never exist at the same time as the result
+        if workers and workers > 1:
+            shard_size = -(-count // workers)
+        else:
+            shard_size = min(count, max(1, 2 ** 20 // length))
+        blocks = _iter_blocks(self, count, max(shard_size, 1), workers, unique=unique,
+                              breach_checker=breach_checker, seed=seed, start=start)
+        
+        if as_array:
+            # Each worker returns its shard as raw bytes; copy them in order
+            data = bytearray(count * length)
+            filled = 0
+            for block in blocks:
+                data[filled:filled + len(block)] = block
+                filled += len(block)
+            return np.frombuffer(data, dtype=f"S{length}")
+        
+        passwords = []
+        for block in blocks:
+            text = block.decode("ascii")
+            passwords.extend(text[i:i + length] for i in range(0, len(text), length))
+        return passwords
+
+
+class PasswordPolicy(_BatchSource):
+    """
+    A reusable password policy compiled once into per-class alphabets.
+    
+    Minimum counts per character class are satisfied by construction: the
+    required characters are drawn from their class, the rest from the full
+    alphabet, and the positions are then shuffled. Every generated password
+    is compliant, so callers never need to regenerate and re-validate.
+    """
+    
+    AMBIGUOUS = "Il1|O0o`'\""
+    CLASSES = ("lower", "upper", "digits", "symbols")
+    
+    def __init__(self, length=16, use_letters=True, use_digits=True, use_symbols=True,
+                 min_lower=0, min_upper=0, min_digits=0, min_symbols=0,
+                 exclude="", exclude_ambiguous=False, alphabets=None):
+        """
+        Args:
+            length: Length of each password.
+            use_letters, use_digits, use_symbols: Character types to include.
+            min_lower, min_upper, min_digits, min_symbols: Minimum number of
+                characters required from each class.
+            exclude: Characters that must never appear.
+            exclude_ambiguous: Also exclude look-alike characters such as
+                l, 1, I, O and 0.
+            alphabets: Optional dict overriding the characters of a class,
+                e.g. {"symbols": "!@#$%"}.
+        """
+        if length < 1:
+            raise ValueError("Password length must be at least 1!")
+        
+        defaults = {
+            "lower": string.ascii_lowercase if use_letters else "",
+            "upper": string.ascii_uppercase if use_letters else "",
+            "digits": string.digits if use_digits else "",
+            "symbols": string.punctuation if use_symbols else "",
+        }
+        for name, chars in (alphabets or {}).items():
+            if name not in defaults:
+                raise ValueError(f"Unknown character class: {name}")
+            defaults[name] = chars
+        
+        excluded = set(exclude) | (set(self.AMBIGUOUS) if exclude_ambiguous else set())
+        minimums = {"lower": min_lower, "upper": min_upper,
+                    "digits": min_digits, "symbols": min_symbols}
+        
+        self.length = length
+        self.alphabets = {}
+        self.minimums = {}
+        for name in self.CLASSES:
+            # dict.fromkeys drops duplicates while keeping the order
+            chars = "".join(dict.fromkeys(c for c in defaults[name] if c not in excluded))
+            if minimums[name] < 0:
+                raise ValueError("Minimum character counts cannot be negative!")
+            if minimums[name] and not chars:
+                raise ValueError(f"Policy requires {name} but none are allowed!")
+            self.alphabets[name] = chars
+            self.minimums[name] = minimums[name]
+        
+        self.alphabet = "".join(dict.fromkeys("".join(self.alphabets.values())))
+        if not self.alphabet:
+            raise ValueError("At least one character type must be selected!")
+        
+        self.combinations = len(self.alphabet) ** length
+        self.required = [(self.alphabets[name], n) for name, n in self.minimums.items() if n]
+        self.required_total = sum(n for _, n in self.required)
+        if self.required_total > length:
+            raise ValueError("Password length is shorter than the required character counts!")
+        
+        # Validate all alphabets up front so generation never fails halfway
+        _build_translation(self.alphabet)
+        for chars, _ in self.required:
+            _build_translation(chars)
+    
+    def __repr__(self):
+        mins = ", ".join(f"min_{name}={n}" for name, n in self.minimums.items() if n)
+        return f"PasswordPolicy(length={self.length}{', ' + mins if mins else ''})"
+    
+    def generate_bytes(self, count, randbytes=secrets.token_bytes):
+        """
+        Generate `count` compliant passwords as one block of ASCII bytes.
+        
+        Returns:
+            bytes: count * length characters, one password after another.
+        """
+        length = self.length
+        free = length - self.required_total
+        if not self.required:
+            return random_characters(self.alphabet, count * length, randbytes)
+        
+        # Draw every class for the whole batch at once, one buffer each
+        parts = [(random_characters(chars, count * n, randbytes), n) for chars, n in self.required]
+        if free:
+            parts.append((random_characters(self.alphabet, count * free, randbytes), free))
+        
+        # Shuffle positions by sorting on random 64-bit keys
+        keys = randbytes(count * length * 8)
+        
+        if NUMPY_AVAILABLE:
+            block = np.concatenate(
+                [np.frombuffer(data, dtype=np.uint8).reshape(count, n) for data, n in parts],
+                axis=1,
+            )
+            # A stable sort breaks (vanishingly rare) key ties like sorted()
+            # does, so seeded output is the same with and without NumPy
+            order = np.argsort(np.frombuffer(keys, dtype=np.uint64).reshape(count, length), axis=1,
+                               kind="stable")
+            return np.take_along_axis(block, order, axis=1).tobytes()
+        
+        keys = memoryview(keys).cast("Q")
+        out = bytearray()
+        for i in range(count):
+            chars = b"".join(data[i * n:(i + 1) * n] for data, n in parts)
+            base = i * length
+            order = sorted(range(length), key=lambda j: keys[base + j])
+            out += bytes(chars[j] for j in order)
+        return bytes(out)
+    
+    def validate(self, password):
+        """
+        Check a password against this policy.
+        
+        Returns:
+            bool: True if the password has the right length, only allowed
+                characters and at least the minimum count of each class.
+        """
+        if len(password) != self.length:
+            return False
+        allowed = set(self.alphabet)
+        if any(c not in allowed for c in password):
+            return False
+        for name, n in self.minimums.items():
+            if n and sum(c in self.alphabets[name] for c in password) < n:
+                return False
+        return True
+
+
+class PasswordTemplate(_BatchSource):
+    """
+    A password format such as "Llll-dddd-ssss" compiled to per-position alphabets.
+    
+    Template syntax:
+        L  uppercase letter         l  lowercase letter
+        a  any letter               d  digit
+        s  special symbol           *  letter, digit or symbol
+        X  uppercase letter/digit   x  lowercase letter/digit
+        A  letter or digit          [..]  one of the listed characters,
+                                          ranges allowed: [A-F0-9]
+        {n}  repeat the previous token n times, e.g. d{4}
+        \\c  the literal character c
+    Any other character is copied literally.
+    
+    Positions that share an alphabet are drawn together from one random
+    buffer per batch and interleaved into place with slice assignment.
+    """
+    
+    TOKENS = {
+        "L": string.ascii_uppercase,
+        "l": string.ascii_lowercase,
+        "a": string.ascii_letters,
+        "d": string.digits,
+        "s": string.punctuation,
+        "*": string.ascii_letters + string.digits + string.punctuation,
+        "X": string.ascii_uppercase + string.digits,
+        "x": string.ascii_lowercase + string.digits,
+        "A": string.ascii_letters + string.digits,
+    }
+    
+    def __init__(self, template):
+        self.template = template
+        self.positions = self._parse(template)
+        self.length = len(self.positions)
+        if not self.length:
+            raise ValueError("Template must contain at least one character!")
+        
+        # Group the random positions by alphabet: {alphabet: [columns]}
+        self.groups = {}
+        self.literals = {}
+        for column, alphabet in enumerate(self.positions):
+            if len(alphabet) == 1:
+                self.literals[column] = alphabet
+            else:
+                self.groups.setdefault(alphabet, []).append(column)
+        for alphabet in self.groups:
+            _build_translation(alphabet)
+        
+        self.combinations = 1
+        for alphabet in self.positions:
+            self.combinations *= len(alphabet)
+        
+        # Literal characters are the same in every password
+        self._skeleton = bytearray(self.length)
+        for column, char in self.literals.items():
+            self._skeleton[column] = ord(char)
+    
+    def __repr__(self):
+        return f"PasswordTemplate({self.template!r})"
+    
+    @classmethod
+    def _parse(cls, template):
+        """Compile a template string into a list of per-position alphabets."""
+        positions = []
+        i = 0
+        while i < len(template):
+            char = template[i]
+            if char == "\\":
+                if i + 1 == len(template):
+                    raise ValueError("Template ends with an unfinished escape!")
+                alphabet = template[i + 1]
+                i += 2
+            elif char == "[":
+                end = template.find("]", i + 2)
+                if end == -1:
+                    raise ValueError("Template has an unclosed [ character set!")
+                alphabet = cls._expand_set(template[i + 1:end])
+                i = end + 1
+            elif char == "{":
+                end = template.find("}", i)
+                if end == -1 or not positions:
+                    raise ValueError("Template repeat {n} must follow a token!")
+                try:
+                    repeat = int(template[i + 1:end])
+                except ValueError:
+                    raise ValueError(f"Invalid template repeat count: {template[i:end + 1]}")
+                if repeat < 1:
+                    raise ValueError("Template repeat count must be at least 1!")
+                positions.extend([positions[-1]] * (repeat - 1))
+                i = end + 1
+                continue
+            else:
+                alphabet = cls.TOKENS.get(char, char)
+                i += 1
+            if not alphabet.isascii():
+                raise ValueError("Template must contain only ASCII characters!")
+            positions.append(alphabet)
+        return positions
+    
+    @staticmethod
+    def _expand_set(spec):
+        """Expand a [..] body such as "A-F0-9" into its characters."""
+        chars = []
+        i = 0
+        while i < len(spec):
+            if i + 2 < len(spec) and spec[i + 1] == "-":
+                start, end = ord(spec[i]), ord(spec[i + 2])
+                if start > end:
+                    raise ValueError(f"Invalid template range: {spec[i:i + 3]}")
+                chars.extend(chr(c) for c in range(start, end + 1))
+                i += 3
+            else:
+                chars.append(spec[i])
+                i += 1
+        return "".join(dict.fromkeys(chars))
+    
+    def generate_bytes(self, count, randbytes=secrets.token_bytes):
+        """
+        Generate `count` passwords as one block of ASCII bytes.
+        
+        Returns:
+            bytes: count * length characters, one password after another.
+        """
+        length = self.length
+        out = self._skeleton * count
+        for alphabet, columns in self.groups.items():
+            k = len(columns)
+            data = random_characters(alphabet, count * k, randbytes)
+            # Column c of every password is every length-th byte from c
+            for offset, column in enumerate(columns):
+                out[column::length] = data[offset::k]
+        return bytes(out)
+    
+    def validate(self, password):
+        """Check that a password matches this template."""
+        return (len(password) == self.length
+                and all(c in alphabet for c, alphabet in zip(password, self.positions)))
+
+
+def generate_passwords(count, length, use_letters=True, use_digits=True, use_symbols=True,
+                       as_array=False, workers=None, unique=False, breach_checker=None,
+                       seed=None, start=0):
+    """
+    Generate many passwords at once from a single CSPRNG buffer.
+    
+    This is much faster than calling generate_password in a loop because the
+    character set is built once and all randomness is drawn in bulk.
+    
+    Args:
+        count: Number of passwords to generate.
+        length: Length of each password.
+        as_array: Return a NumPy array of fixed-width bytes (dtype S<length>)
+            instead of a list of strings. Requires NumPy.
+        workers: Number of processes to shard the batch across. None or 1
+            generates in the current process.
+        unique: Guarantee that no password appears twice in the batch.
+        breach_checker: Optional BreachChecker; breached passwords are replaced.
+        seed: Generate a reproducible batch from this seed.
+        start: With a seed, index of the first password in the sequence.
+    
+    Returns:
+        list: `count` passwords (or a NumPy array when as_array is True).
+    """
+    if length < 1:
+        raise ValueError("Password length must be at least 1!")
+    
+    policy = PasswordPolicy(length, use_letters, use_digits, use_symbols)
+    return policy.generate_batch(count, as_array=as_array, workers=workers, unique=unique,
+                                 breach_checker=breach_checker, seed=seed, start=start)
+
+
+def _generate_shard(policy, size):
+    """
+    Worker entry point: generate `size` passwords as one block of raw bytes.
+    
+    Every process reads from the operating system CSPRNG (secrets/os.urandom),
+    which is seeded and reseeded by the kernel independently of the parent,
+    so shards never share random state.
+    """
+    return policy.generate_bytes(size)
+
+
+def shard_sizes(count, shard_size):
+    """Split `count` into shards of `shard_size` plus one smaller remainder."""
+    for start in range(0, count, shard_size):
+        yield min(shard_size, count - start)
+
+
+def imap_bounded(func, tasks, workers, ordered=True):
+    """
+    Run func(*task) for every task on a process pool with bounded memory.
+    
+    At most 2 * workers tasks are in flight at any time, so results are
+    consumed as they arrive and `tasks` can be an endless generator.
+    
+    Yields:
+        The result of each task, in submission order when `ordered` is
+        True, otherwise in completion order.
+    """
+    tasks = iter(tasks)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        
+        for task in tasks:
+            pending.append(executor.submit(func, *task))
+            if len(pending) >= 2 * workers:
+                break
+        
+        while pending:
+            if ordered:
+                done = pending.popleft()
+            else:
+                done = next(as_completed(pending))
+                pending.remove(done)
+            yield done.result()
+            
+            task = next(tasks, None)
+            if task is not None:
+                pending.append(executor.submit(func, *task))
+
+
+def _run_sharded(policy, count, shard_size, workers, ordered=True):
+    """
+    Generate `count` passwords across a process pool, one shard per task.
+    
+    Yields:
+        bytes: The characters of each shard, in submission order when
+            `ordered` is True, otherwise in completion order.
+    """
+    tasks = ((policy, size) for size in shard_sizes(count, shard_size))
+    return imap_bounded(_generate_shard, tasks, workers, ordered)
+
+
+def _iter_blocks(policy, count, chunk_size, workers=None, ordered=True, unique=False,
+                 breach_checker=None, error_rate=1e-6, seed=None, start=0):
+    """
+    Generate `count` passwords as raw byte blocks of up to `chunk_size` each.
+    
+    Every block is passed through the enabled filters: a BreachChecker drops
+    passwords found in the breach corpus, and with `unique` a Bloom filter
+    sized for `count` drops duplicates. Rejected passwords are replaced by
+    further rounds of generation until `count` passwords have been produced.
+    
+    With a seed, passwords come from the seed's sequence starting at index
+    `start` and blocks are always yielded in order. Replacements for
+    rejected passwords continue the sequence after the last one drawn.
+    
+    Yields:
+        bytes: Fixed-width passwords packed back to back.
+    """
+    drawn = start
+    
+    def blocks(total):
+        nonlocal drawn
+        if seed is not None:
+            first, drawn = drawn, drawn + total
+            tasks = ((policy, seed, first + offset, min(chunk_size, total - offset))
+                     for offset in range(0, total, chunk_size))
+            if workers and workers > 1 and total > 1:
+                return imap_bounded(seeded_bytes, tasks, workers)
+            return (seeded_bytes(*task) for task in tasks)
+        if workers and workers > 1 and total > 1:
+            return _run_sharded(policy, total, chunk_size, workers, ordered)
+        return (policy.generate_bytes(size) for size in shard_sizes(total, chunk_size))
+    
+    length = policy.length
+    filters = []
+    if breach_checker is not None:
+        filters.append(breach_checker.filter_block)
+    if unique:
+        if count > policy.combinations:
+            raise ValueError("Not enough possible passwords for that many unique ones!")
+        filters.append(BloomFilter(count, error_rate).filter_block)
+    
+    if not filters:
+        yield from blocks(count)
+        return
+    
+    remaining = count
+    stalled = 0
+    while remaining > 0:
+        # Always draw at least a full chunk so that the last few passwords
+        # are not found one failed draw at a time; surplus is discarded
+        produced = 0
+        for data in blocks(max(remaining, min(chunk_size, count))):
+            for keep in filters:
+                data = keep(data, length)
+            data = data[:(remaining - produced) * length]
+            produced += len(data) // length
+            if data:
+                yield data
+            if produced == remaining:
+                break
+        stalled = 0 if produced else stalled + 1
+        if stalled >= 100:
+            raise RuntimeError("Could not find enough acceptable passwords for this policy!")
+        remaining -= produced
+
+
+def iter_passwords(count, length, use_letters=True, use_digits=True, use_symbols=True,
+                   chunk_size=10_000, workers=None, ordered=True, policy=None, unique=False,
+                   breach_checker=None, seed=None, start=0):
+    """
+    Lazily generate `count` passwords in chunks of `chunk_size`.
+    
+    Only a bounded number of chunks is held in memory at a time, so
+    arbitrarily large counts run in constant memory.
+    
+    Args:
+        workers: Number of processes generating chunks in parallel.
+        ordered: When using workers, yield chunks in order (True) or as soon
+            as each one is ready (False).
+        policy: PasswordPolicy or PasswordTemplate to use instead of
+            `length` and the use_* flags.
+        unique: Guarantee that no password is yielded twice, using a Bloom
+            filter whose memory is bounded by `count` (about 3.6 bytes each).
+        breach_checker: Optional BreachChecker; passwords found in its breach
+            corpus are never yielded.
+        seed: Generate a reproducible sequence from this seed; chunks are
+            then always yielded in order.
+        start: With a seed, index of the first password in the sequence.
+    
+    Yields:
+        list: The next chunk of passwords.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1!")
+    if policy is None:
+        policy = PasswordPolicy(length, use_letters, use_digits, use_symbols)
+    length = policy.length
+    
+    for data in _iter_blocks(policy, count, chunk_size, workers, ordered, unique, breach_checker,
+                             seed=seed, start=start):
+        text = data.decode("ascii")
+        yield [text[i:i + length] for i in range(0, len(text), length)]
+
+
+def write_passwords(chunks, stream, fmt="lines"):
+    """
+    Write chunks of passwords to a text stream.
+    
+    Args:
+        chunks: Iterable of password lists (e.g. from iter_passwords).
+        stream: Writable text file object.
+        fmt: Output format, one of "lines", "json", "jsonl" or "csv".
+    
+    Returns:
+        int: Number of passwords written.
+    """
+    written = 0
+    if fmt == "lines":
+        for chunk in chunks:
+            stream.write("\n".join(chunk))
+            stream.write("\n")
+            written += len(chunk)
+    elif fmt == "jsonl":
+        for chunk in chunks:
+            stream.write("\n".join(json.dumps(p) for p in chunk))
+            stream.write("\n")
+            written += len(chunk)
+    elif fmt == "json":
+        # Stream a JSON array element by element instead of json.dump(list)
+        stream.write("[")
+        for chunk in chunks:
+            prefix = ",\n" if written else "\n"
+            stream.write(prefix + ",\n".join(json.dumps(p) for p in chunk))
+            written += len(chunk)
+        stream.write("\n]\n" if written else "]\n")
+    elif fmt == "csv":
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(["password"])
+        for chunk in chunks:
+            writer.writerows([p] for p in chunk)
+            written += len(chunk)
+    else:
+        raise ValueError(f"Unknown output format: {fmt}")
+    return written
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments for non-interactive mode."""
+    parser = argparse.ArgumentParser(
+        description="Generate random passwords. Runs interactively when no options are given."
+    )
+    parser.add_argument("-n", "--count", type=int, default=1,
+                        help="number of passwords to generate (default: 1)")
+    parser.add_argument("-l", "--length", type=int, default=16,
+                        help="length of each password (default: 16)")
+    parser.add_argument("--no-letters", action="store_true", help="exclude letters")
+    parser.add_argument("--no-digits", action="store_true", help="exclude digits")
+    parser.add_argument("--no-symbols", action="store_true", help="exclude special symbols")
+    parser.add_argument("-t", "--template",
+                        help="generate from a format such as 'Llll-dddd-ssss' or 'X{4}-X{4}-X{4}'")
+    parser.add_argument("--min-lower", type=int, default=0, metavar="N",
+                        help="require at least N lowercase letters")
+    parser.add_argument("--min-upper", type=int, default=0, metavar="N",
+                        help="require at least N uppercase letters")
+    parser.add_argument("--min-digits", type=int, default=0, metavar="N",
+                        help="require at least N digits")
+    parser.add_argument("--min-symbols", type=int, default=0, metavar="N",
+                        help="require at least N special symbols")
+    parser.add_argument("--exclude", default="", metavar="CHARS",
+                        help="characters that must never appear")
+    parser.add_argument("--exclude-ambiguous", action="store_true",
+                        help="exclude look-alike characters (l, 1, I, O, 0, ...)")
+    parser.add_argument("-u", "--unique", action="store_true",
+                        help="never output the same password twice")
+    parser.add_argument("--passphrase", type=int, metavar="WORDS",
+                        help="generate passphrases of WORDS words instead of passwords (needs --wordlist)")
+    parser.add_argument("--wordlist", metavar="FILE",
+                        help="word list for --passphrase, one word per line (EFF format accepted)")
+    parser.add_argument("--separator", default="-",
+                        help="separator between passphrase words (default: -)")
+    parser.add_argument("--capitalize", action="store_true",
+                        help="capitalize each passphrase word")
+    parser.add_argument("--hash", choices=("pbkdf2_sha256", "scrypt"),
+                        help="output provisioning records (password, salt, hash) hashed with this algorithm")
+    parser.add_argument("--iterations", type=int,
+                        help="PBKDF2 iterations for --hash pbkdf2_sha256 (default: 600000)")
+    parser.add_argument("--breach-file", metavar="FILE",
+                        help="sorted SHA-1 hash list; generated passwords found in it are replaced")
+    parser.add_argument("--audit", metavar="FILE",
+                        help="check the passwords in FILE (one per line, - for stdin) against --breach-file")
+    parser.add_argument("--score", metavar="FILE",
+                        help="score the strength of the passwords in FILE (one per line, - for stdin)")
+    parser.add_argument("--seed",
+                        help="reproducible output for test fixtures: the same seed always gives the "
+                             "same passwords (never use for real credentials)")
+    parser.add_argument("--start", type=int, default=0, metavar="N",
+                        help="with --seed, start at password N of the seed's sequence (default: 0)")
+    parser.add_argument("-o", "--out", help="write to this file instead of stdout")
+    parser.add_argument("--format", choices=("lines", "json", "jsonl", "csv"), default="lines",
+                        help="output format (default: lines)")
+    parser.add_argument("--chunk-size", type=int, default=10_000,
+                        help="passwords generated per buffered chunk (default: 10000)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="number of worker processes, 0 for one per CPU (default: 1)")
+    parser.add_argument("--unordered", action="store_true",
+                        help="with --workers, write chunks as soon as they are ready")
+    return parser.parse_args(argv)
+
+
+def run_score(args):
+    """Score a password file according to parsed arguments and stream the results."""
+    scores = score_passwords(iter_file_passwords(args.score))
+    
+    if args.out:
+        with open(args.out, "w", encoding="utf-8", newline="") as f:
+            ratings = write_scores(scores, f, args.format)
+    else:
+        ratings = write_scores(scores, sys.stdout, args.format)
+    
+    # Summary goes to stderr so it never mixes with the scored output
+    total = sum(ratings.values())
+    print(f"Scored {total} passwords", file=sys.stderr)
+    for _, rating in RATINGS:
+        if ratings[rating]:
+            print(f"  {rating:<12} {ratings[rating]:>10} ({ratings[rating] / total:.1%})", file=sys.stderr)
+    return total
+
+
+def parse_seed(value):
+    """Interpret a --seed value: whole numbers are int seeds, anything else a str seed."""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def run_passphrases(args):
+    """Generate passphrases according to parsed arguments and stream them out."""
+    if not args.wordlist:
+        raise ValueError("--passphrase requires --wordlist FILE")
+    
+    if args.start < 0:
+        raise ValueError("Start index cannot be negative!")
+    
+    seed = parse_seed(args.seed)
+    
+    def seeded_chunks(wordlist):
+        # Passphrase i of a seed lives in block i // SEED_BLOCK, as seeded
+        # passwords do, so a slice never depends on --start or --chunk-size
+        end = args.start + args.count
+        for block in range(args.start // SEED_BLOCK, -(-end // SEED_BLOCK)):
+            phrases = generate_passphrases(wordlist, SEED_BLOCK, args.passphrase, args.separator,
+                                           args.capitalize, CounterRandom(seed, block).randbytes)
+            base = block * SEED_BLOCK
+            yield phrases[max(args.start, base) - base:min(end, base + SEED_BLOCK) - base]
+    
+    with WordList(args.wordlist) as wordlist:
+        print(f"{len(wordlist)} words, {wordlist.bits_per_word * args.passphrase:.1f} bits per passphrase",
+              file=sys.stderr)
+        if seed is not None:
+            chunks = seeded_chunks(wordlist)
+        else:
+            chunks = (
+                generate_passphrases(wordlist, min(args.chunk_size, args.count - start), args.passphrase,
+                                     args.separator, args.capitalize)
+                for start in range(0, args.count, args.chunk_size)
+            )
+        if args.out:
+            with open(args.out, "w", encoding="utf-8", newline="") as f:
+                return write_passwords(chunks, f, args.format)
+        return write_passwords(chunks, sys.stdout, args.format)
+
+
+def write_audit(passwords, checker, stream, fmt="lines", batch_size=10_000):
+    """
+    Check passwords against a breach corpus in batches and write the results.
+    
+    Args:
+        fmt: Output format, one of "lines", "json", "jsonl" or "csv".
+    
+    Returns:
+        tuple: (passwords checked, passwords found in the corpus)
+    """
+    if fmt not in ("lines", "json", "jsonl", "csv"):
+        raise ValueError(f"Unknown output format: {fmt}")
+    checked = breached = 0
+    writer = csv.writer(stream, lineterminator="\n") if fmt == "csv" else None
+    if writer:
+        writer.writerow(["password", "breach_count"])
+    elif fmt == "json":
+        stream.write("[")
+    
+    passwords = iter(passwords)
+    while True:
+        batch = list(islice(passwords, batch_size))
+        if not batch:
+            break
+        for password, count in zip(batch, checker.check_many(batch)):
+            if fmt == "lines":
+                stream.write(f"{'BREACHED' if count else 'ok':<9} {count:>10}  {password}\n")
+            elif writer:
+                writer.writerow([password, count])
+            elif fmt == "jsonl":
+                stream.write(json.dumps({"password": password, "breach_count": count}) + "\n")
+            else:
+                prefix = ",\n" if checked else "\n"
+                stream.write(prefix + json.dumps({"password": password, "breach_count": count}))
+            checked += 1
+            breached += bool(count)
+    
+    if fmt == "json":
+        stream.write("\n]\n" if checked else "]\n")
+    return checked, breached
+
+
+def run_audit(args):
+    """Audit a password file against the breach corpus and stream the results."""
+    if not args.breach_file:
+        raise ValueError("--audit requires --breach-file FILE")
+    
+    with BreachChecker(args.breach_file) as checker:
+        passwords = iter_file_passwords(args.audit)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8", newline="") as f:
+                checked, breached = write_audit(passwords, checker, f, args.format)
+        else:
+            checked, breached = write_audit(passwords, checker, sys.stdout, args.format)
+    
+    print(f"Checked {checked} passwords, {breached} found in breach corpus", file=sys.stderr)
+    return checked
+
+
+def run_provision(args, source, workers, breach_checker=None):
+    """Generate and hash passwords, streaming records and reporting throughput."""
+    # Imported here because provisioning builds on this module
+    from provisioning import ThroughputMeter, iter_records, write_records
+    
+    if args.iterations is not None and args.iterations < 1:
+        raise ValueError("Iterations must be at least 1!")
+    # Hashing is slow, so keep tasks small enough to spread evenly over workers
+    meter = ThroughputMeter(iter_records(
+        args.count, source, args.hash, args.iterations,
+        workers=workers, chunk_size=min(args.chunk_size, 500), ordered=not args.unordered,
+        seed=parse_seed(args.seed), start=args.start,
+        unique=args.unique, breach_checker=breach_checker,
+    ))
+    # --format applies to the records too; the default "lines" writes them tab-separated
+    if args.out:
+        with open(args.out, "w", encoding="utf-8", newline="") as f:
+            write_records(meter, f, args.format)
+    else:
+        write_records(meter, sys.stdout, args.format)
+    print(meter.report(), file=sys.stderr)
+    return meter.records
+
+
+def run_headless(args):
+    """Generate passwords according to parsed arguments and stream them out."""
+    if args.score:
+        return run_score(args)
+    if args.audit:
+        return run_audit(args)
+    if args.passphrase is not None:
+        return run_passphrases(args)
+    
+    if args.count < 0:
+        raise ValueError("Password count cannot be negative!")
+    if args.workers < 0:
+        raise ValueError("Number of workers cannot be negative!")
+    if args.start < 0:
+        raise ValueError("Start index cannot be negative!")
+    workers = args.workers or os.cpu_count()
+    
+    if args.template:
+        policy = PasswordTemplate(args.template)
+    else:
+        policy = PasswordPolicy(
+            args.length,
+            use_letters=not args.no_letters,
+            use_digits=not args.no_digits,
+            use_symbols=not args.no_symbols,
+            min_lower=args.min_lower,
+            min_upper=args.min_upper,
+            min_digits=args.min_digits,
+            min_symbols=args.min_symbols,
+            exclude=args.exclude,
+            exclude_ambiguous=args.exclude_ambiguous,
+        )
+    checker = BreachChecker(args.breach_file) if args.breach_file else None
+    try:
+        if args.hash:
+            return run_provision(args, policy, workers, checker)
+        
+        chunks = iter_passwords(
+            args.count, policy.length,
+            policy=policy,
+            chunk_size=args.chunk_size,
+            workers=workers,
+            ordered=not args.unordered,
+            unique=args.unique,
+            breach_checker=checker,
+            seed=parse_seed(args.seed),
+            start=args.start,
+        )
+        
+        if args.out:
+            with open(args.out, "w", encoding="ascii", newline="") as f:
+                return write_passwords(chunks, f, args.format)
+        return write_passwords(chunks, sys.stdout, args.format)
+    finally:
+        if checker is not None:
+            checker.close()
+
+
 def get_user_preferences():
     """
     Get password generation preferences from the user via command-line input.
@@ -82,8 +1039,26 @@ def display_password_info(length, use_letters, use_digits, use_symbols):
     print("-"*50)
 
 
-def main():
+def main(argv=None):
     """Main function to run the password generator."""
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    # Any command-line option switches to non-interactive (scriptable) mode
+    if argv:
+        args = parse_args(argv)
+        try:
+            run_headless(args)
+        except BrokenPipeError:
+            # Output was piped into something that closed early (e.g. head);
+            # keep the interpreter from failing again when it flushes stdout
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            sys.exit(1)
+        except (ValueError, RuntimeError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(2)
+        return
+    
     try:
         while True:
             # Get user preferences
@@ -0,0 +1,263 @@
+"""
+Benchmark suite for the Password Generator.
+
+Covers:
+    latency     single-call latency (p50/p99) of each way to get one password
+    throughput  passwords/s across lengths 8-4096 and alphabets, comparing
+                the random.choices loop, a secrets.choice loop and the
+                batch API
+    features    policies, templates, unique batches, workers and scoring
+    memory      peak memory per million passwords (tracemalloc)
+
+Results are printed as a table and can be saved as JSON (--json FILE) so
+runs from different releases can be compared.
+
+Usage:
+    python benchmark.py [--quick] [--json results.json] [--only latency,memory]
+"""
+import argparse
+import json
+import os
+import platform
+import secrets
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from Password_Generator import (
+    NUMPY_AVAILABLE,
+    PasswordPolicy,
+    PasswordTemplate,
+    build_charset,
+    generate_password,
+    generate_passwords,
+)
+from password_pool import PasswordPool
+from password_strength import MAX_GRID_WIDTH, score_password, score_passwords
+
+LENGTHS = (8, 16, 32, 64, 256, 1024, 4096)
+ALPHABETS = {
+    "digits": dict(use_letters=False, use_digits=True, use_symbols=False),
+    "letters": dict(use_letters=True, use_digits=False, use_symbols=False),
+    "all": dict(use_letters=True, use_digits=True, use_symbols=True),
+}
+SECTIONS = ("latency", "throughput", "features", "memory")
+
+
+def time_call(func, *args, **kwargs):
+    """Run func once and return (result, seconds)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def secrets_password(length, use_letters=True, use_digits=True, use_symbols=True):
+    """The straightforward secrets-based equivalent of generate_password."""
+    characters = build_charset(use_letters, use_digits, use_symbols)
+    return "".join(secrets.choice(characters) for _ in range(length))
+
+
+def template_wrapper():
+    """A per-character "Llll-dddd-ssss" wrapper around generate_password."""
+    return (generate_password(1, use_digits=False, use_symbols=False).upper()
+            + generate_password(3, use_digits=False, use_symbols=False).lower() + "-"
+            + generate_password(4, use_letters=False, use_symbols=False) + "-"
+            + generate_password(4, use_letters=False, use_digits=False))
+
+
+class Suite:
+    """Collects benchmark results and prints them as they are measured."""
+
+    def __init__(self):
+        self.results = []
+
+    def add(self, section, name, params, count, seconds, **extra):
+        """Record a throughput result."""
+        rate = count / seconds if seconds else float("inf")
+        result = {"section": section, "name": name, "params": params,
+                  "count": count, "seconds": round(seconds, 6), "per_second": round(rate, 1)}
+        result.update(extra)
+        self.results.append(result)
+
+        label = name + (" " + " ".join(f"{k}={v}" for k, v in params.items()) if params else "")
+        line = f"  {label:<46} {seconds:8.3f} s  {rate:14,.0f} /s"
+        if "speedup" in extra:
+            line += f"  ({extra['speedup']:5.1f}x)"
+        print(line)
+
+    def add_latency(self, name, samples):
+        """Record a latency distribution given in seconds."""
+        samples = sorted(samples)
+        p50 = samples[len(samples) // 2] * 1e6
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6
+        mean = statistics.fmean(samples) * 1e6
+        self.results.append({"section": "latency", "name": name, "samples": len(samples),
+                             "p50_us": round(p50, 3), "p99_us": round(p99, 3), "mean_us": round(mean, 3)})
+        print(f"  {name:<46} p50 {p50:9.2f} us  p99 {p99:9.2f} us")
+
+    def add_memory(self, name, params, count, peak_bytes):
+        """Record peak memory, scaled to one million passwords."""
+        per_million = peak_bytes / count * 1_000_000
+        self.results.append({"section": "memory", "name": name, "params": params, "count": count,
+                             "peak_bytes": peak_bytes, "bytes_per_million": round(per_million)})
+        label = name + " " + " ".join(f"{k}={v}" for k, v in params.items())
+        print(f"  {label:<46} {per_million / 2 ** 20:9.1f} MiB per million")
+
+
+def measure_latency(func, samples):
+    """Time `samples` individual calls of func."""
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def bench_latency(suite, quick):
+    samples = 2_000 if quick else 20_000
+    suite.add_latency("generate_password(16)", measure_latency(lambda: generate_password(16), samples))
+    suite.add_latency("secrets.choice loop (16)", measure_latency(lambda: secrets_password(16), samples))
+    policy = PasswordPolicy(16)
+    suite.add_latency("PasswordPolicy(16).generate()", measure_latency(policy.generate, samples))
+    with PasswordPool(policy, capacity=samples) as pool:
+        suite.add_latency("PasswordPool.get()", measure_latency(pool.get, samples))
+
+
+def bench_throughput(suite, quick):
+    # Keep the work per cell roughly constant: ~2M characters (200k quick)
+    budget = 200_000 if quick else 2_000_000
+    lengths = LENGTHS[::2] if quick else LENGTHS
+    for alphabet, flags in ALPHABETS.items():
+        for length in lengths:
+            count = max(10, budget // length)
+            params = {"length": length, "alphabet": alphabet}
+            _, loop = time_call(lambda: [generate_password(length, **flags) for _ in range(count)])
+            suite.add("throughput", "random.choices loop", params, count, loop)
+            _, sec = time_call(lambda: [secrets_password(length, **flags) for _ in range(count)])
+            suite.add("throughput", "secrets.choice loop", params, count, sec, speedup=loop / sec)
+            _, batch = time_call(generate_passwords, count, length, **flags)
+            suite.add("throughput", "generate_passwords", params, count, batch, speedup=loop / batch)
+
+
+def bench_features(suite, quick):
+    count = 20_000 if quick else 200_000
+    length = 16
+    params = {"length": length}
+
+    _, loop = time_call(lambda: [generate_password(length) for _ in range(count)])
+    suite.add("features", "generate_password loop", params, count, loop)
+
+    if NUMPY_AVAILABLE:
+        _, t = time_call(generate_passwords, count, length, as_array=True)
+        suite.add("features", "generate_passwords as_array", params, count, t, speedup=loop / t)
+
+    _, t = time_call(generate_passwords, count, length, unique=True)
+    suite.add("features", "generate_passwords unique", params, count, t, speedup=loop / t)
+
+    policy = PasswordPolicy(length, min_upper=1, min_digits=2, min_symbols=2)
+    _, t = time_call(policy.generate_batch, count)
+    suite.add("features", "PasswordPolicy min classes", params, count, t, speedup=loop / t)
+
+    template = {"template": "Llll-dddd-ssss"}
+    _, wrapper = time_call(lambda: [template_wrapper() for _ in range(count)])
+    suite.add("features", "template per-char wrapper", template, count, wrapper)
+    _, t = time_call(PasswordTemplate("Llll-dddd-ssss").generate_batch, count)
+    suite.add("features", "PasswordTemplate", template, count, t, speedup=wrapper / t)
+
+    for workers in sorted({2, os.cpu_count() or 1}):
+        _, t = time_call(generate_passwords, count, length, workers=workers)
+        suite.add("features", "generate_passwords workers", {"length": length, "workers": workers},
+                  count, t, speedup=loop / t)
+
+    passwords = generate_passwords(count, length)
+    _, scalar = time_call(lambda: [score_password(p) for p in passwords])
+    suite.add("features", "score_password loop", params, count, scalar)
+    _, t = time_call(lambda: list(score_passwords(passwords)))
+    # The batched scores must equal score_password's, including for NUL bytes
+    # (also the grid's padding byte) and passwords too long for the grid
+    sample = passwords[:1000] + ["a\x00b", "\x00\x00", "pass\x00", "x" * (MAX_GRID_WIDTH + 1)]
+    identical = list(score_passwords(sample)) == [score_password(p) for p in sample]
+    suite.add("features", "score_passwords batched", params, count, t, speedup=scalar / t,
+              identical=identical)
+    print(f"  score_passwords identical to score_password: {'yes' if identical else 'NO'}")
+
+
+def peak_memory(func):
+    """Return the peak traced allocation size while func runs and its result is alive."""
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+
+def bench_memory(suite, quick):
+    count = 100_000 if quick else 1_000_000
+    for length in (8, 16, 64):
+        params = {"length": length}
+        suite.add_memory("generate_password loop", params, count,
+                         peak_memory(lambda: [generate_password(length) for _ in range(count)]))
+        suite.add_memory("generate_passwords", params, count,
+                         peak_memory(lambda: generate_passwords(count, length)))
+        if NUMPY_AVAILABLE:
+            suite.add_memory("generate_passwords as_array", params, count,
+                             peak_memory(lambda: generate_passwords(count, length, as_array=True)))
+
+
+def metadata(args):
+    """Describe the machine and settings a run was measured on."""
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": NUMPY_AVAILABLE,
+        "quick": args.quick,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the password generator.")
+    parser.add_argument("--quick", action="store_true", help="smaller counts for a fast smoke run")
+    parser.add_argument("--json", metavar="FILE", help="also write results to FILE as JSON")
+    parser.add_argument("--only", default=",".join(SECTIONS),
+                        help=f"comma-separated sections to run (default: {','.join(SECTIONS)})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sections = [s.strip() for s in args.only.split(",") if s.strip()]
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        print(f"Unknown section(s): {', '.join(sorted(unknown))}", file=sys.stderr)
+        sys.exit(2)
+
+    suite = Suite()
+    meta = metadata(args)
+    print("=" * 78)
+    print(f"Password Generator Benchmark (Python {meta['python']}, {meta['cpus']} CPUs, "
+          f"NumPy {'yes' if NUMPY_AVAILABLE else 'no'})")
+    print("=" * 78)
+
+    runners = {"latency": bench_latency, "throughput": bench_throughput,
+               "features": bench_features, "memory": bench_memory}
+    for section in sections:
+        print(f"\n[{section}]")
+        runners[section](suite, args.quick)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": suite.results}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
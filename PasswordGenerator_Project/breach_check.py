@@ -0,0 +1,188 @@
+"""
+Offline breached-password checks against a local, sorted SHA-1 hash list.
+
+Two file layouts are supported:
+
+    text    One "HASH" or "HASH:COUNT" line per password, sorted by hash,
+            as in the downloadable Pwned Passwords "ordered by hash" file.
+    binary  Packed 20-byte SHA-1 digests, sorted (see pack_hash_file).
+            About half the size of the text file and faster to search.
+
+The file is memory-mapped and binary-searched, so even a file of tens of
+GB is never read into memory: each lookup touches about log2(lines) pages.
+"""
+import hashlib
+import mmap
+import os
+
+DIGEST_SIZE = 20
+HEX_SIZE = DIGEST_SIZE * 2
+
+
+def sha1_hex(password):
+    """Return the uppercase hex SHA-1 digest of a password."""
+    return hashlib.sha1(password.encode("utf-8")).hexdigest().upper()
+
+
+class BreachChecker:
+    """
+    Look passwords up in a sorted SHA-1 hash file.
+
+    Usage:
+        with BreachChecker("pwned-passwords-sha1-ordered-by-hash-v8.txt") as checker:
+            if "hunter2" in checker:
+                ...
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        if not self.size:
+            self._file.close()
+            raise ValueError("Hash file is empty!")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        head = self._data[:HEX_SIZE]
+        try:
+            int(head, 16)
+            self.binary = False
+        except ValueError:
+            self.binary = True
+        if self.binary and self.size % DIGEST_SIZE:
+            self.close()
+            raise ValueError("Hash file is neither a text hash list nor packed 20-byte digests!")
+        # Some lists use lowercase hex; compare in the file's own case
+        self._lowercase = not self.binary and head != head.upper()
+
+    def _key(self, password):
+        digest = hashlib.sha1(password.encode("utf-8"))
+        if self.binary:
+            return digest.digest()
+        key = digest.hexdigest().encode("ascii")
+        return key if self._lowercase else key.upper()
+
+    def _search_binary(self, key, lo):
+        """Binary search packed digests; return (count, next lo)."""
+        data = self._data
+        lo_rec, hi_rec = lo // DIGEST_SIZE, self.size // DIGEST_SIZE
+        while lo_rec < hi_rec:
+            mid = (lo_rec + hi_rec) // 2
+            record = data[mid * DIGEST_SIZE:(mid + 1) * DIGEST_SIZE]
+            if record < key:
+                lo_rec = mid + 1
+            elif record > key:
+                hi_rec = mid
+            else:
+                return 1, mid * DIGEST_SIZE
+        return 0, lo_rec * DIGEST_SIZE
+
+    def _search_text(self, key, lo):
+        """Binary search hash lines; return (count, next lo)."""
+        data = self._data
+        hi = self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = data.rfind(b"\n", lo, mid) + 1 or lo
+            end = data.find(b"\n", start)
+            if end == -1:
+                end = self.size
+            line_key = data[start:start + HEX_SIZE]
+            if line_key < key:
+                lo = end + 1
+            elif line_key > key:
+                hi = start
+            else:
+                line = data[start:end].rstrip(b"\r")
+                count = line[HEX_SIZE + 1:]
+                return (int(count) if count.isdigit() else 1), start
+        return 0, lo
+
+    def _search(self, key, lo=0):
+        if self.binary:
+            return self._search_binary(key, lo)
+        return self._search_text(key, lo)
+
+    def count(self, password):
+        """
+        Return how often a password appears in the breach corpus.
+
+        Returns:
+            int: The count stored in the file (1 when the file has no
+                counts), or 0 if the password is not in the file.
+        """
+        return self._search(self._key(password))[0]
+
+    def __contains__(self, password):
+        return self.count(password) > 0
+
+    def check_many(self, passwords):
+        """
+        Look up many passwords at once.
+
+        Lookups are done in hash order so every search starts where the
+        previous one ended, touching each region of the file only once.
+
+        Returns:
+            list: The breach count of each password, in input order.
+        """
+        keys = sorted((self._key(p), i) for i, p in enumerate(passwords))
+        counts = [0] * len(keys)
+        lo = 0
+        for key, i in keys:
+            counts[i], lo = self._search(key, lo)
+        return counts
+
+    def filter_block(self, data, length):
+        """
+        Drop breached passwords from a block of fixed-width passwords.
+
+        Args:
+            data: Fixed-width passwords packed back to back, as produced by
+                PasswordPolicy.generate_bytes.
+            length: Width of each password in bytes.
+
+        Returns:
+            bytes: The passwords that are not in the breach corpus.
+        """
+        passwords = [data[i:i + length].decode("ascii") for i in range(0, len(data), length)]
+        counts = self.check_many(passwords)
+        return "".join(p for p, n in zip(passwords, counts) if not n).encode("ascii")
+
+    def close(self):
+        """Release the memory map and file handle."""
+        self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def pack_hash_file(src, dst, buffer_lines=1_000_000):
+    """
+    Convert a sorted text hash list into packed 20-byte binary digests.
+
+    The input is streamed, so converting a multi-GB file uses constant
+    memory. Counts are dropped.
+
+    Returns:
+        int: Number of hashes written.
+    """
+    written = 0
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        chunk = []
+        for line in fin:
+            line = line.strip()
+            if not line:
+                continue
+            chunk.append(bytes.fromhex(line[:HEX_SIZE].decode("ascii")))
+            if len(chunk) >= buffer_lines:
+                fout.write(b"".join(chunk))
+                written += len(chunk)
+                chunk = []
+        fout.write(b"".join(chunk))
+        written += len(chunk)
+    return written
@@ -0,0 +1,208 @@
+"""
+Diceware-style passphrase generation from a local word list.
+
+The word list is a plain text file with one word per line. EFF-style lists
+("11111<TAB>abacus") are supported too: only the last field of each line
+is used.
+
+The first time a list is used, an index of line offsets is written next to
+it (<wordlist>.idx). Afterwards both files are memory-mapped, so opening
+even a 1M-word list is O(1) and looking up word i is a constant-time slice
+instead of reading and splitting the whole file.
+"""
+import math
+import mmap
+import os
+import secrets
+import struct
+from array import array
+
+INDEX_MAGIC = b"PWIDX001"
+# magic, word list size, word list mtime (ns), number of words
+INDEX_HEADER = struct.Struct("<8sQQQ")
+
+
+def _scan_offsets(data):
+    """Return the start offset of every non-blank line plus the end offset."""
+    offsets = array("Q")
+    end = len(data)
+    start = 0
+    while start < end:
+        newline = data.find(b"\n", start)
+        if newline == -1:
+            newline = end
+        if data[start:newline].strip():
+            offsets.append(start)
+        start = newline + 1
+    offsets.append(end)
+    return offsets
+
+
+def build_index(wordlist_path, index_path=None):
+    """
+    Scan a word list once and write its offset index.
+
+    Returns:
+        str: Path of the written index file.
+    """
+    index_path = index_path or wordlist_path + ".idx"
+    stat = os.stat(wordlist_path)
+
+    with open(wordlist_path, "rb") as f:
+        if stat.st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                offsets = _scan_offsets(data)
+        else:
+            offsets = array("Q", [0])
+
+    if offsets.itemsize != 8:
+        raise RuntimeError("Unsupported platform: array('Q') is not 64-bit")
+
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, len(offsets) - 1))
+        offsets.tofile(f)
+    os.replace(tmp_path, index_path)
+    return index_path
+
+
+class WordList:
+    """
+    A memory-mapped word list with O(1) random access by position.
+
+    Usage:
+        with WordList("eff_large_wordlist.txt") as words:
+            print(len(words), words[1234])
+    """
+
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+
+        self._file = open(path, "rb")
+        stat = os.fstat(self._file.fileno())
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+
+        self._index_file = None
+        self._index = None
+        self._view = None
+        self._offsets = self._open_index(stat)
+        self.size = len(self._offsets) - 1
+        if self.size < 2:
+            self.close()
+            raise ValueError("Word list must contain at least two words!")
+
+    def _open_index(self, stat):
+        """Map an up-to-date index, rebuilding it if it is missing or stale."""
+        for attempt in range(2):
+            try:
+                index_file = open(self.index_path, "rb")
+            except FileNotFoundError:
+                index_file = None
+
+            if index_file is not None:
+                header = index_file.read(INDEX_HEADER.size)
+                if len(header) == INDEX_HEADER.size:
+                    magic, size, mtime, count = INDEX_HEADER.unpack(header)
+                    expected = INDEX_HEADER.size + (count + 1) * 8
+                    if (magic == INDEX_MAGIC and size == stat.st_size and mtime == stat.st_mtime_ns
+                            and os.fstat(index_file.fileno()).st_size == expected):
+                        self._index_file = index_file
+                        self._index = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+                        self._view = memoryview(self._index)[INDEX_HEADER.size:]
+                        return self._view.cast("Q")
+                index_file.close()
+
+            if attempt == 0:
+                try:
+                    build_index(self.path, self.index_path)
+                except OSError:
+                    break
+
+        # Index directory is read-only: fall back to an in-memory index
+        return memoryview(_scan_offsets(self._data))
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.size:
+            raise IndexError("word index out of range")
+        line = self._data[self._offsets[i]:self._offsets[i + 1]]
+        return line.split()[-1].decode("utf-8")
+
+    @property
+    def bits_per_word(self):
+        """Entropy contributed by each uniformly chosen word."""
+        return math.log2(self.size)
+
+    def close(self):
+        """Release the memory maps and file handles."""
+        # Views into the index map must be released before it can be closed
+        self._offsets.release()
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._index is not None:
+            self._index.close()
+            self._index_file.close()
+            self._index = None
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def random_indices(n, total, randbytes=secrets.token_bytes):
+    """
+    Draw `total` uniform integers in [0, n) from one buffer of random bytes.
+
+    Uses 32-bit values with rejection sampling, so there is no modulo bias.
+
+    Returns:
+        list: The drawn integers.
+    """
+    if not 1 <= n <= 2 ** 32:
+        raise ValueError("Word list size must be between 1 and 2**32!")
+    limit = 2 ** 32 - (2 ** 32 % n)
+    result = []
+    while len(result) < total:
+        needed = total - len(result)
+        values = memoryview(randbytes((int(needed * 2 ** 32 / limit) + 8) * 4)).cast("I")
+        result.extend(v % n for v in values if v < limit)
+    return result[:total]
+
+
+def generate_passphrases(wordlist, count, words=6, separator="-", capitalize=False,
+                         randbytes=secrets.token_bytes):
+    """
+    Generate `count` passphrases of `words` words each.
+
+    Args:
+        wordlist: An open WordList.
+        separator: String placed between words.
+        capitalize: Capitalize the first letter of every word.
+
+    Returns:
+        list: The passphrases.
+    """
+    if words < 1:
+        raise ValueError("Passphrase must contain at least one word!")
+    if count < 0:
+        raise ValueError("Passphrase count cannot be negative!")
+
+    indices = random_indices(len(wordlist), count * words, randbytes)
+    chosen = [wordlist[i] for i in indices]
+    if capitalize:
+        chosen = [w[:1].upper() + w[1:] for w in chosen]
+    return [separator.join(chosen[i:i + words]) for i in range(0, len(chosen), words)]
+
+
+def generate_passphrase(wordlist, words=6, separator="-", capitalize=False):
+    """Generate a single passphrase (see generate_passphrases)."""
+    return generate_passphrases(wordlist, 1, words, separator, capitalize)[0]
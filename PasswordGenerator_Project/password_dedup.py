@@ -0,0 +1,160 @@
+"""
+Memory-bounded duplicate detection for large password batches.
+
+A Bloom filter answers "have I seen this password before?" in a fixed
+amount of memory. It can return false positives (a new password reported
+as seen) but never false negatives, so when it is used to reject
+duplicates during generation:
+
+    * no duplicate can ever get through, and
+    * a false positive only throws away one fresh password, which is then
+      replaced by another draw.
+
+Memory for `capacity` passwords at false-positive rate p is
+    -capacity * ln(p) / ln(2)^2 bits,
+independent of password length. At the default p = 1e-6 that is about
+3.6 bytes per password (3.6 MB per million), against roughly 60-80 bytes
+per entry for a Python set of short strings.
+"""
+import math
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+FNV_OFFSET = 0xCBF29CE484222325
+FNV_PRIME = 0x100000001B3
+MASK64 = 0xFFFFFFFFFFFFFFFF
+MIX = 0x9E3779B97F4A7C15
+
+
+def _fnv1a(data):
+    """Return the 64-bit FNV-1a hash of a bytes object."""
+    h = FNV_OFFSET
+    for b in data:
+        h = ((h ^ b) * FNV_PRIME) & MASK64
+    return h
+
+
+def _second_hash(h):
+    """Derive an odd second hash from the first for double hashing."""
+    h = ((h ^ (h >> 33)) * MIX) & MASK64
+    return (h ^ (h >> 29)) | 1
+
+
+class BloomFilter:
+    """
+    A fixed-size Bloom filter over password strings.
+
+    The filter is sized once for an expected number of entries and never
+    grows; adding more than `capacity` entries raises the false-positive
+    rate above `error_rate` but never lets a duplicate through.
+    """
+
+    def __init__(self, capacity, error_rate=1e-6):
+        """
+        Args:
+            capacity: Expected number of distinct passwords.
+            error_rate: Target false-positive rate at full capacity.
+        """
+        if capacity < 1:
+            capacity = 1
+        if not 0 < error_rate < 1:
+            raise ValueError("Error rate must be between 0 and 1!")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    @staticmethod
+    def estimate_memory(capacity, error_rate=1e-6):
+        """Return the number of bytes a filter for `capacity` entries will use."""
+        bits = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        return (bits + 7) // 8
+
+    @property
+    def memory_bytes(self):
+        """Size of the bit array in bytes."""
+        return len(self.bits)
+
+    def _positions(self, data):
+        h1 = _fnv1a(data)
+        h2 = _second_hash(h1)
+        return [((h1 + i * h2) & MASK64) % self.size for i in range(self.hashes)]
+
+    def __contains__(self, password):
+        data = password.encode("utf-8") if isinstance(password, str) else password
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(data))
+
+    def __len__(self):
+        return self.count
+
+    def add(self, password):
+        """
+        Add a password to the filter.
+
+        Returns:
+            bool: True if the password was not (probably) seen before.
+        """
+        data = password.encode("utf-8") if isinstance(password, str) else password
+        positions = self._positions(data)
+        if all(self.bits[p >> 3] & (1 << (p & 7)) for p in positions):
+            return False
+        for p in positions:
+            self.bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+        return True
+
+    def filter_block(self, data, length):
+        """
+        Keep only the unseen passwords of a block and add them to the filter.
+
+        Args:
+            data: Fixed-width passwords packed back to back, as produced by
+                PasswordPolicy.generate_bytes.
+            length: Width of each password in bytes.
+
+        Returns:
+            bytes: The new passwords, in their original order.
+        """
+        if not data:
+            return data
+        if not NUMPY_AVAILABLE:
+            return b"".join(
+                data[i:i + length] for i in range(0, len(data), length)
+                if self.add(data[i:i + length])
+            )
+
+        rows = np.frombuffer(data, dtype=np.uint8).reshape(-1, length)
+
+        # Vectorized FNV-1a over the columns, identical to _fnv1a per row
+        h1 = np.full(len(rows), FNV_OFFSET, dtype=np.uint64)
+        prime = np.uint64(FNV_PRIME)
+        for column in rows.T:
+            h1 = (h1 ^ column) * prime
+        h2 = (h1 ^ (h1 >> np.uint64(33))) * np.uint64(MIX)
+        h2 = (h2 ^ (h2 >> np.uint64(29))) | np.uint64(1)
+
+        steps = np.arange(self.hashes, dtype=np.uint64)
+        positions = (h1[:, None] + steps * h2[:, None]) % np.uint64(self.size)
+        byte_index = (positions >> np.uint64(3)).astype(np.intp)
+        bit_mask = (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8))
+
+        bits = np.frombuffer(self.bits, dtype=np.uint8)
+        seen = ((bits[byte_index] & bit_mask) != 0).all(axis=1)
+
+        # Within the block only the first copy of each hash counts as new
+        first = np.zeros(len(rows), dtype=bool)
+        first[np.unique(h1, return_index=True)[1]] = True
+        keep = ~seen & first
+
+        np.bitwise_or.at(bits, byte_index[keep].ravel(), bit_mask[keep].ravel())
+        self.count += int(keep.sum())
+        return rows[keep].tobytes()
@@ -0,0 +1,151 @@
+"""
+A pool of pre-generated passwords for low-latency serving.
+
+Generating a batch is far cheaper per password than generating one at a
+time, so a PasswordPool keeps a bounded queue of passwords for one policy
+and a background thread tops it up in batches whenever it drops below a
+low-water mark. get() is then an O(1) pop on the caller's thread.
+
+Passwords wait in memory until they are handed out; size the pool for the
+expected burst rather than making it as large as possible. Use one pool
+per PasswordPolicy.
+"""
+import threading
+import time
+from collections import deque
+
+from Password_Generator import PasswordPolicy
+
+
+class PasswordPool:
+    """
+    Bounded queue of pre-generated passwords refilled by a background thread.
+
+    Usage:
+        with PasswordPool(PasswordPolicy(20, min_digits=2), capacity=5000) as pool:
+            password = pool.get()
+    """
+
+    def __init__(self, policy=None, capacity=10_000, low_water=None, breach_checker=None,
+                 start=True):
+        """
+        Args:
+            policy: PasswordPolicy to generate with (default: 16 characters,
+                all character types).
+            capacity: Maximum number of passwords held in the pool.
+            low_water: Refill when fewer than this many remain
+                (default: half of capacity).
+            breach_checker: Optional BreachChecker passed to generation.
+            start: Fill the pool and start the refill thread immediately.
+        """
+        if capacity < 1:
+            raise ValueError("Pool capacity must be at least 1!")
+        self.policy = policy or PasswordPolicy()
+        self.capacity = capacity
+        self.low_water = capacity // 2 if low_water is None else low_water
+        if not 0 <= self.low_water <= capacity:
+            raise ValueError("Low-water mark must be between 0 and the capacity!")
+        self.breach_checker = breach_checker
+
+        self._queue = deque()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+        self.refill_seconds = 0.0
+        self.last_refill_seconds = 0.0
+
+        if start:
+            self.start()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def start(self):
+        """Fill the pool once and start the background refill thread."""
+        if self._thread is not None:
+            return
+        self._refill()
+        self._thread = threading.Thread(target=self._run, name="PasswordPoolRefill", daemon=True)
+        self._thread.start()
+
+    def _refill(self):
+        """Top the queue up to capacity with one batch."""
+        missing = self.capacity - len(self._queue)
+        if missing <= 0:
+            return
+        started = time.perf_counter()
+        batch = self.policy.generate_batch(missing, breach_checker=self.breach_checker)
+        self._queue.extend(batch)
+        elapsed = time.perf_counter() - started
+        self.refills += 1
+        self.refill_seconds += elapsed
+        self.last_refill_seconds = elapsed
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopped.is_set():
+                break
+            self._refill()
+
+    def get(self):
+        """
+        Return a password, popping it from the pool.
+
+        If the pool has run dry the password is generated on the caller's
+        thread (counted as a miss) instead of blocking on the refill.
+        """
+        try:
+            password = self._queue.popleft()
+            hit = True
+        except IndexError:
+            hit = False
+            password = self.policy.generate_batch(1, breach_checker=self.breach_checker)[0]
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if len(self._queue) < self.low_water:
+            self._wake.set()
+        return password
+
+    def stats(self):
+        """
+        Return pool counters.
+
+        Returns:
+            dict: size, hits, misses, hit_rate, refills and refill times.
+        """
+        served = self.hits + self.misses
+        return {
+            "size": len(self._queue),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / served if served else 1.0,
+            "refills": self.refills,
+            "refill_seconds": self.refill_seconds,
+            "last_refill_seconds": self.last_refill_seconds,
+        }
+
+    def close(self):
+        """Stop the refill thread and discard the remaining passwords."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._queue.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
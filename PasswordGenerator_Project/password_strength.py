@@ -0,0 +1,311 @@
+"""
+Password strength and entropy scoring.
+
+Scores whole batches of passwords at once. With NumPy installed each batch
+is packed into a 2-D byte array and every metric is computed with array
+operations; without NumPy, and for passwords longer than MAX_GRID_WIDTH
+bytes, the same metrics are computed per password.
+
+Metrics per password:
+    charset_bits  length * log2(size of the character classes used)
+    shannon_bits  length * Shannon entropy of the character frequencies
+    repeats       characters identical to the previous one ("aaa")
+    sequences     characters continuing a run ("abc", "321", "qwerty")
+    strength_bits charset_bits with every predictable character counted
+                  as 1 bit instead of log2(charset)
+"""
+import csv
+import json
+import math
+import sys
+from collections import Counter, namedtuple
+from itertools import islice
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+StrengthScore = namedtuple(
+    "StrengthScore",
+    "password length classes charset_bits shannon_bits repeats sequences strength_bits rating",
+)
+
+# (upper bound in bits, rating), checked in order
+RATINGS = (
+    (28, "Very Weak"),
+    (36, "Weak"),
+    (60, "Reasonable"),
+    (128, "Strong"),
+    (math.inf, "Very Strong"),
+)
+
+# Character class sizes used for the charset entropy estimate
+CLASS_SIZES = {"lower": 26, "upper": 26, "digits": 10, "symbols": 33, "other": 128}
+
+# Longest password (in UTF-8 bytes) scored on the NumPy path. The padded
+# grid costs batch size x width, so one very long line would otherwise blow
+# up the whole batch; longer passwords are scored one by one instead.
+MAX_GRID_WIDTH = 256
+
+# Rows whose neighbouring characters count as an easy-to-guess sequence
+SEQUENCES = (
+    "abcdefghijklmnopqrstuvwxyz",
+    "0123456789",
+    "qwertyuiop",
+    "asdfghjkl",
+    "zxcvbnm",
+)
+
+
+def _build_sequence_table():
+    """Return a 256x256 table of byte pairs that continue a sequence."""
+    table = [[False] * 256 for _ in range(256)]
+    for row in SEQUENCES:
+        for a, b in zip(row, row[1:]):
+            for x, y in ((a, b), (b, a)):
+                for cx in {x, x.upper()}:
+                    for cy in {y, y.upper()}:
+                        table[ord(cx)][ord(cy)] = True
+    return table
+
+
+_SEQUENCE_TABLE = _build_sequence_table()
+
+
+def _byte_class(value):
+    """Return the class name of a single byte value."""
+    if 97 <= value <= 122:
+        return "lower"
+    if 65 <= value <= 90:
+        return "upper"
+    if 48 <= value <= 57:
+        return "digits"
+    if 32 <= value <= 126:
+        return "symbols"
+    return "other"
+
+
+def rating_for(bits):
+    """Return the rating label for an entropy estimate in bits."""
+    for limit, rating in RATINGS:
+        if bits < limit:
+            return rating
+    return RATINGS[-1][1]
+
+
+def _strength(length, charset, repeats, sequences):
+    """Combine the raw metrics into (charset_bits, strength_bits)."""
+    per_char = math.log2(charset) if charset > 1 else 0.0
+    predictable = repeats + sequences
+    charset_bits = length * per_char
+    strength_bits = (length - predictable) * per_char + min(predictable, length) * min(per_char, 1.0)
+    return charset_bits, strength_bits
+
+
+def score_password(password):
+    """
+    Score a single password.
+
+    Passwords are measured as UTF-8 bytes, so every non-ASCII byte falls in
+    the "other" class.
+
+    Returns:
+        StrengthScore: All metrics for the password.
+    """
+    data = password.encode("utf-8")
+    length = len(data)
+    classes = {_byte_class(b) for b in data}
+    charset = sum(CLASS_SIZES[c] for c in classes)
+
+    shannon = 0.0
+    for n in Counter(data).values():
+        p = n / length
+        shannon += p * math.log2(1 / p)
+
+    repeats = sum(a == b for a, b in zip(data, data[1:]))
+    sequences = sum(_SEQUENCE_TABLE[a][b] for a, b in zip(data, data[1:]))
+    charset_bits, strength_bits = _strength(length, charset, repeats, sequences)
+
+    return StrengthScore(
+        password, length, len(classes), round(charset_bits, 2), round(shannon * length, 2),
+        repeats, sequences, round(strength_bits, 2), rating_for(strength_bits),
+    )
+
+
+def _score_batch_numpy(passwords, encoded=None):
+    """Score a list of passwords with array operations over a padded byte matrix."""
+    if encoded is None:
+        encoded = [p.encode("utf-8") for p in passwords]
+    count = len(encoded)
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=count)
+    width = max(int(lengths.max()), 1)
+
+    # Fixed-width bytes zero-pad every row to the longest password
+    grid = np.array(encoded, dtype=f"S{width}").view(np.uint8).reshape(count, width)
+    valid = np.arange(width) < lengths[:, None]
+
+    # Class coverage
+    lower = ((grid >= 97) & (grid <= 122)).any(axis=1)
+    upper = ((grid >= 65) & (grid <= 90)).any(axis=1)
+    digits = ((grid >= 48) & (grid <= 57)).any(axis=1)
+    printable = (grid >= 32) & (grid <= 126)
+    alnum = ((grid >= 97) & (grid <= 122)) | ((grid >= 65) & (grid <= 90)) | ((grid >= 48) & (grid <= 57))
+    symbols = (printable & ~alnum & valid).any(axis=1)
+    other = (~printable & valid).any(axis=1)
+
+    classes = lower.astype(np.int64) + upper + digits + symbols + other
+    charset = (lower * CLASS_SIZES["lower"] + upper * CLASS_SIZES["upper"]
+               + digits * CLASS_SIZES["digits"] + symbols * CLASS_SIZES["symbols"]
+               + other * CLASS_SIZES["other"])
+
+    # Shannon entropy: length * H = n*log2(n) - sum(c*log2(c)) over character
+    # counts c. Sorting each row groups equal bytes into runs; the k-th byte
+    # of a run adds k*log2(k) - (k-1)*log2(k-1), so the sum needs no histogram.
+    # Padding becomes 256 first so it can never join a run of real NUL bytes.
+    ordered = np.sort(np.where(valid, grid, np.uint16(256)).astype(np.uint16), axis=1)
+    positions = np.arange(width)
+    run_start = np.ones((count, width), dtype=bool)
+    run_start[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    first = np.maximum.accumulate(np.where(run_start, positions, 0), axis=1)
+    k = (positions - first + 1).astype(np.float64)
+    k_log_k = k * np.log2(k)
+    increments = k_log_k - (k - 1) * np.log2(np.maximum(k - 1, 1))
+    # Padding sorts last, so the real characters are the first `length`
+    real = valid
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n_log_n = np.where(lengths > 0, lengths * np.log2(np.maximum(lengths, 1)), 0.0)
+    shannon = np.maximum(n_log_n - np.where(real, increments, 0.0).sum(axis=1), 0.0)
+
+    # Repeats and sequences over neighbouring pairs
+    pair_valid = valid[:, 1:]
+    repeats = ((grid[:, 1:] == grid[:, :-1]) & pair_valid).sum(axis=1)
+    table = np.array(_SEQUENCE_TABLE, dtype=bool)
+    sequences = (table[grid[:, :-1], grid[:, 1:]] & pair_valid).sum(axis=1)
+
+    # Strength estimate, identical to _strength but on whole columns
+    with np.errstate(divide="ignore"):
+        per_char = np.where(charset > 1, np.log2(np.maximum(charset, 1)), 0.0)
+    predictable = repeats + sequences
+    charset_bits = lengths * per_char
+    strength_bits = ((lengths - predictable) * per_char
+                     + np.minimum(predictable, lengths) * np.minimum(per_char, 1.0))
+
+    limits = np.array([limit for limit, _ in RATINGS[:-1]])
+    labels = np.array([rating for _, rating in RATINGS], dtype=object)
+    ratings = labels[np.searchsorted(limits, strength_bits, side="right")]
+
+    return list(map(
+        StrengthScore,
+        passwords,
+        lengths.tolist(),
+        classes.tolist(),
+        charset_bits.round(2).tolist(),
+        shannon.round(2).tolist(),
+        repeats.tolist(),
+        sequences.tolist(),
+        strength_bits.round(2).tolist(),
+        ratings.tolist(),
+    ))
+
+
+def score_passwords(passwords, batch_size=10_000):
+    """
+    Score an iterable of passwords, a batch at a time.
+
+    The iterable is consumed lazily, so scoring a file of millions of
+    passwords only keeps one batch in memory.
+
+    Yields:
+        StrengthScore: One score per password, in input order.
+    """
+    passwords = iter(passwords)
+    while True:
+        batch = list(islice(passwords, batch_size))
+        if not batch:
+            return
+        if NUMPY_AVAILABLE:
+            yield from _score_batch(batch)
+        else:
+            yield from map(score_password, batch)
+
+
+def _score_batch(passwords):
+    """Score a batch with NumPy, sending passwords over MAX_GRID_WIDTH to score_password."""
+    encoded = [p.encode("utf-8") for p in passwords]
+    long_rows = [i for i, data in enumerate(encoded) if len(data) > MAX_GRID_WIDTH]
+    if not long_rows:
+        return _score_batch_numpy(passwords, encoded)
+
+    long_set = set(long_rows)
+    short = [i for i in range(len(passwords)) if i not in long_set]
+    scores = [None] * len(passwords)
+    if short:
+        short_scores = _score_batch_numpy([passwords[i] for i in short], [encoded[i] for i in short])
+        for i, score in zip(short, short_scores):
+            scores[i] = score
+    for i in long_rows:
+        scores[i] = score_password(passwords[i])
+    return scores
+
+
+def iter_file_passwords(path, encoding="utf-8"):
+    """
+    Stream passwords from a text file, one per line ("-" reads stdin).
+
+    Yields:
+        str: Each non-empty line without its line ending.
+    """
+    if path == "-":
+        for line in sys.stdin:
+            line = line.rstrip("\r\n")
+            if line:
+                yield line
+        return
+
+    with open(path, encoding=encoding, errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if line:
+                yield line
+
+
+def write_scores(scores, stream, fmt="lines"):
+    """
+    Write strength scores to a text stream.
+
+    Args:
+        scores: Iterable of StrengthScore.
+        stream: Writable text file object.
+        fmt: Output format, one of "lines", "json", "jsonl" or "csv".
+
+    Returns:
+        Counter: Number of passwords per rating.
+    """
+    ratings = Counter()
+    if fmt == "lines":
+        for s in scores:
+            stream.write(f"{s.rating:<12} {s.strength_bits:8.2f}  {s.password}\n")
+            ratings[s.rating] += 1
+    elif fmt == "json":
+        stream.write("[")
+        for s in scores:
+            stream.write((",\n" if ratings else "\n") + json.dumps(s._asdict()))
+            ratings[s.rating] += 1
+        stream.write("\n]\n" if ratings else "]\n")
+    elif fmt == "jsonl":
+        for s in scores:
+            stream.write(json.dumps(s._asdict()) + "\n")
+            ratings[s.rating] += 1
+    elif fmt == "csv":
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(StrengthScore._fields)
+        for s in scores:
+            writer.writerow(s)
+            ratings[s.rating] += 1
+    else:
+        raise ValueError(f"Unknown output format: {fmt}")
+    return ratings
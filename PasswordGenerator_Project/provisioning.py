@@ -0,0 +1,228 @@
+"""
+Generate-and-hash pipeline for account provisioning.
+
+Each record holds a freshly generated password together with its salted
+hash, ready to be stored:
+
+    {"id": 0, "password": "...", "algorithm": "pbkdf2_sha256",
+     "params": "i=600000", "salt": "<hex>", "hash": "<hex>"}
+
+Hashing is deliberately slow, so it dominates the pipeline. With workers
+each process generates and hashes a whole chunk on its own, so only the
+finished records travel back to the parent. At most 2 * workers chunks
+are in flight and records are written as they arrive, which keeps memory
+bounded however many accounts are provisioned.
+"""
+import csv
+import hashlib
+import hmac
+import json
+import os
+import time
+
+from Password_Generator import PasswordPolicy, imap_bounded, iter_passwords
+
+ALGORITHMS = ("pbkdf2_sha256", "scrypt")
+
+# OWASP-recommended minimums
+PBKDF2_ITERATIONS = 600_000
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+SALT_BYTES = 16
+
+RECORD_FIELDS = ("id", "password", "algorithm", "params", "salt", "hash")
+
+
+def _params(algorithm, iterations):
+    """Return the parameter string stored alongside a hash."""
+    if algorithm == "pbkdf2_sha256":
+        return f"i={iterations or PBKDF2_ITERATIONS}"
+    if algorithm == "scrypt":
+        if iterations is not None:
+            raise ValueError("Iterations only apply to pbkdf2_sha256, not scrypt!")
+        return f"n={SCRYPT_N},r={SCRYPT_R},p={SCRYPT_P}"
+    raise ValueError(f"Unknown hash algorithm: {algorithm}")
+
+
+def hash_password(password, algorithm="pbkdf2_sha256", iterations=None, salt=None):
+    """
+    Hash a password with a random salt.
+
+    Args:
+        algorithm: "pbkdf2_sha256" or "scrypt".
+        iterations: PBKDF2 iteration count (default: PBKDF2_ITERATIONS).
+        salt: Salt bytes; a random 16-byte salt is used when omitted.
+
+    Returns:
+        tuple: (hash_hex, salt_hex)
+    """
+    salt = salt if salt is not None else os.urandom(SALT_BYTES)
+    data = password.encode("utf-8")
+    if algorithm == "pbkdf2_sha256":
+        digest = hashlib.pbkdf2_hmac("sha256", data, salt, iterations or PBKDF2_ITERATIONS)
+    elif algorithm == "scrypt":
+        digest = hashlib.scrypt(data, salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, dklen=32)
+    else:
+        raise ValueError(f"Unknown hash algorithm: {algorithm}")
+    return digest.hex(), salt.hex()
+
+
+def verify_password(password, hash_hex, salt_hex, algorithm="pbkdf2_sha256", iterations=None):
+    """Check a password against a hash produced by hash_password."""
+    candidate, _ = hash_password(password, algorithm, iterations, bytes.fromhex(salt_hex))
+    return hmac.compare_digest(candidate, hash_hex)
+
+
+def _hash_chunk(start, passwords, algorithm, iterations):
+    """
+    Worker entry point: hash already generated passwords.
+
+    Returns:
+        list: Record tuples in RECORD_FIELDS order, ids from `start`.
+    """
+    params = _params(algorithm, iterations)
+    records = []
+    for i, password in enumerate(passwords, start):
+        digest, salt = hash_password(password, algorithm, iterations)
+        records.append((i, password, algorithm, params, salt, digest))
+    return records
+
+
+def _provision_chunk(source, start, size, algorithm, iterations, seed=None):
+    """
+    Worker entry point: generate and hash `size` passwords.
+
+    With a seed the passwords are those at ids start .. start + size - 1 of
+    the seed's sequence; salts are always random.
+
+    Returns:
+        list: Record tuples in RECORD_FIELDS order, ids from `start`.
+    """
+    passwords = source.generate_batch(size, seed=seed, start=start if seed is not None else 0)
+    return _hash_chunk(start, passwords, algorithm, iterations)
+
+
+def _filtered_tasks(count, source, algorithm, iterations, chunk_size, seed, start,
+                    unique, breach_checker):
+    """Generate filtered passwords here and yield _hash_chunk tasks for them."""
+    first = start
+    for passwords in iter_passwords(count, source.length, chunk_size=chunk_size, policy=source,
+                                    unique=unique, breach_checker=breach_checker,
+                                    seed=seed, start=start):
+        yield first, passwords, algorithm, iterations
+        first += len(passwords)
+
+
+def iter_records(count, source=None, algorithm="pbkdf2_sha256", iterations=None,
+                 workers=None, chunk_size=500, ordered=True, seed=None, start=0,
+                 unique=False, breach_checker=None):
+    """
+    Lazily generate `count` (password, hash, salt) records in chunks.
+
+    Args:
+        source: PasswordPolicy or PasswordTemplate (default: PasswordPolicy()).
+        algorithm: "pbkdf2_sha256" or "scrypt".
+        iterations: PBKDF2 iteration count; not allowed with scrypt.
+        workers: Number of processes generating and hashing in parallel.
+        chunk_size: Records per task.
+        ordered: With workers, yield chunks in id order (True) or as soon
+            as each one is ready (False).
+        seed: Generate reproducible passwords from this seed (salts, and
+            therefore hashes, still differ between runs).
+        start: Id of the first record; with a seed, also the index of its
+            password in the seed's sequence.
+        unique: Never issue the same password twice (see iter_passwords).
+        breach_checker: Optional BreachChecker; breached passwords are
+            replaced before they are hashed.
+
+    With either filter the passwords are generated in this process, where
+    the filters can see all of them, and workers only hash; with a seed,
+    replacements for rejected passwords continue the seed's sequence.
+
+    Yields:
+        list: The next chunk of record tuples.
+    """
+    _params(algorithm, iterations)
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1!")
+    source = source or PasswordPolicy()
+
+    if unique or breach_checker is not None:
+        func = _hash_chunk
+        tasks = _filtered_tasks(count, source, algorithm, iterations, chunk_size, seed, start,
+                                unique, breach_checker)
+    else:
+        func = _provision_chunk
+        end = start + count
+        tasks = ((source, first, min(chunk_size, end - first), algorithm, iterations, seed)
+                 for first in range(start, end, chunk_size))
+
+    if workers and workers > 1:
+        yield from imap_bounded(func, tasks, workers, ordered)
+    else:
+        for task in tasks:
+            yield func(*task)
+
+
+def write_records(chunks, stream, fmt="jsonl"):
+    """
+    Write record chunks to a text stream.
+
+    Args:
+        chunks: Iterable of record lists (e.g. from iter_records).
+        stream: Writable text file object.
+        fmt: Output format, one of "jsonl", "json", "csv" or "lines"
+            (tab-separated).
+
+    Returns:
+        int: Number of records written.
+    """
+    written = 0
+    if fmt == "csv":
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(RECORD_FIELDS)
+    elif fmt == "json":
+        stream.write("[")
+    elif fmt not in ("jsonl", "lines"):
+        raise ValueError(f"Unknown output format: {fmt}")
+
+    for chunk in chunks:
+        if fmt == "csv":
+            writer.writerows(chunk)
+        elif fmt == "lines":
+            stream.write("".join("\t".join(map(str, r)) + "\n" for r in chunk))
+        else:
+            lines = [json.dumps(dict(zip(RECORD_FIELDS, r))) for r in chunk]
+            if fmt == "jsonl":
+                stream.write("\n".join(lines) + "\n")
+            else:
+                stream.write((",\n" if written else "\n") + ",\n".join(lines))
+        written += len(chunk)
+
+    if fmt == "json":
+        stream.write("\n]\n" if written else "]\n")
+    return written
+
+
+class ThroughputMeter:
+    """Wrap a chunk iterator and measure records per second."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.records = 0
+        self.started = None
+        self.seconds = 0.0
+
+    def __iter__(self):
+        self.started = time.perf_counter()
+        for chunk in self.chunks:
+            self.records += len(chunk)
+            yield chunk
+            self.seconds = time.perf_counter() - self.started
+
+    def report(self):
+        """Return a one-line throughput summary."""
+        rate = self.records / self.seconds if self.seconds else 0.0
+        return f"{self.records} records in {self.seconds:.2f} s ({rate:,.1f} records/s)"